@@ -4,8 +4,9 @@ Useful for batch operations without the Semantic Kernel pipeline.
 """
 
 import os
+import asyncio
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from storage.rca_vector_store import RCAVectorStore
 
 load_dotenv()
@@ -23,6 +24,8 @@ class AgentManager:
     def __init__(self):
         # Initialize OpenAI client
         self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Async client for non-blocking fault analysis
+        self.async_openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
         # Initialize RCA vector store (Pinecone integration)
         self.vector_store = RCAVectorStore()
@@ -45,7 +48,7 @@ class AgentManager:
         Chunk RCA reports and store them into Pinecone for semantic search.
         :param rca_dir: Folder where RCA reports are saved
         """
-        return self.vector_store.chunk_and_store_reports(rca_dir)
+        return self.vector_store.chunk_and_store_reports(rca_dir)["message"]
 
     def search_similar_rcas(self, query: str, top_k: int = 5):
         """
@@ -55,13 +58,13 @@ class AgentManager:
         """
         return self.vector_store.search_similar(query, top_k=top_k)
 
-    def analyze_faults(self, query: str):
+    async def analyze_faults(self, query: str):
         """
         Use OpenAI to analyze RCA findings and summarize potential causes.
         :param query: Query about network fault
         """
         try:
-            response = self.openai_client.chat.completions.create(
+            response = await self.async_openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an RCA assistant helping analyze network faults."},
@@ -72,6 +75,13 @@ class AgentManager:
         except Exception as e:
             return f"❌ RCA Analysis failed: {e}"
 
+    async def analyze_faults_batch(self, queries):
+        """
+        Analyze several fault queries concurrently.
+        :param queries: List of queries about network faults
+        """
+        return await asyncio.gather(*[self.analyze_faults(q) for q in queries])
+
 
 # If you want to test locally
 if __name__ == "__main__":
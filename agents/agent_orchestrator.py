@@ -5,6 +5,9 @@ Manages Azure OpenAI client setup, prompt formatting, function registration, and
 """
 
 import os
+import re
+import asyncio
+from pathlib import Path
 import semantic_kernel as sk
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 from semantic_kernel.connectors.ai.prompt_execution_settings import PromptExecutionSettings
@@ -18,11 +21,29 @@ from agents.prompts import (
 from utils.slack_notifier import SlackNotifier
 from dotenv import load_dotenv
 
+# Patterns used to clean LLM output before saving an RCA report
+_MARKDOWN_BLOCK_RE = re.compile(r"```markdown\s*(.*?)```", re.S)
+_PYTHON_LINE_RE = re.compile(
+    r"^.*(?:def |rca_markdown =|logfile =|save_rca_report).*(?:\n|$)", re.M
+)
+# Log lines kept when condensing long logs for the prompts
+_SEVERITY_LINE_RE = re.compile(r"\b(?:ERROR|WARN|WARNING|CRIT|CRITICAL|FATAL|ALERT)\b")
+
 class AgentOrchestrator:
+    # Prompt window for long logs: head + severity lines + tail
+    CONDENSE_HEAD_LINES = 100
+    CONDENSE_TAIL_LINES = 100
+    CONDENSE_MAX_SEVERITY_LINES = 500
+
     def __init__(self):
         load_dotenv(override=True)
+        # Upper bound on in-flight LLM invocations in process_incidents
+        self.max_concurrent_llm_calls = int(os.getenv("CONCURRENCY", "8"))
         self.kernel = sk.Kernel()
         self.slack = SlackNotifier()
+        # Create rca_reports directory once rather than on every save
+        self.rca_dir = os.path.join(os.getcwd(), "rca_reports")
+        os.makedirs(self.rca_dir, exist_ok=True)
         # Configure Azure OpenAI
         azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
@@ -63,57 +84,55 @@ class AgentOrchestrator:
         )
 
     def read_log_file(self, log_file_path):
-        """Read and return the content of a log file"""
-        try:
-            with open(log_file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            return content
-        except Exception as e:
-            return f"Error reading log file: {str(e)}"
+        """
+        Read and return the content of a log file.
+        Undecodable bytes are replaced rather than raised, whatever the file size;
+        OS errors propagate so callers never send an error message to the LLM as log content.
+        """
+        return Path(log_file_path).read_bytes().decode('utf-8', 'replace')
+
+    def notify(self, message, incident_data=None):
+        """Queue a Slack notification, off the incident critical path."""
+        self.slack.enqueue(message, incident_data)
+
+    async def drain_notifications(self):
+        """Wait for queued Slack notifications; call before shutting down."""
+        await self.slack.close()
+
+    def condense_log(self, log_content):
+        """
+        Shrink a long log before it is embedded in the prompts: keep the first
+        and last lines for context plus the ERROR/WARN/CRITICAL lines between.
+        Short logs are returned unchanged.
+        """
+        lines = log_content.splitlines()
+        head, tail = self.CONDENSE_HEAD_LINES, self.CONDENSE_TAIL_LINES
+        if len(lines) <= head + tail + self.CONDENSE_MAX_SEVERITY_LINES:
+            return log_content
+        middle = [line for line in lines[head:-tail] if _SEVERITY_LINE_RE.search(line)]
+        return "\n".join(
+            lines[:head] + middle[:self.CONDENSE_MAX_SEVERITY_LINES] + lines[-tail:]
+        )
 
     def save_rca_report(self, log_file_path, rca_content):
         """Save RCA report to rca_reports folder"""
         try:
-            # Create rca_reports directory if it doesn't exist
-            rca_dir = os.path.join(os.getcwd(), "rca_reports")
-            os.makedirs(rca_dir, exist_ok=True)
-            
             # Generate filename based on log file
             log_filename = os.path.basename(log_file_path)
             rca_filename = f"rca_{os.path.splitext(log_filename)[0]}.txt"
-            rca_filepath = os.path.join(rca_dir, rca_filename)
+            rca_filepath = os.path.join(self.rca_dir, rca_filename)
             
             # Clean up the RCA content
             cleaned_content = str(rca_content)
             
             # Extract markdown content between ```markdown and ```
-            if "```markdown" in cleaned_content:
-                start = cleaned_content.find("```markdown")
-                end = cleaned_content.find("```", start + 3)
-                if end != -1:
-                    cleaned_content = cleaned_content[start + 3:end].strip()
+            match = _MARKDOWN_BLOCK_RE.search(cleaned_content)
+            if match:
+                cleaned_content = match.group(1).strip()
             
-            # If still contains Python code, clean it further
+            # If still contains Python code, drop those lines
             if "def " in cleaned_content or "rca_markdown =" in cleaned_content:
-                lines = cleaned_content.split('\n')
-                content_lines = []
-                in_content = False
-                
-                for line in lines:
-                    # Skip Python function definitions and variable assignments
-                    if any(skip in line.strip() for skip in ['def ', 'rca_markdown =', 'logfile =', 'save_rca_report']):
-                        continue
-                    # Skip empty lines at the beginning
-                    if not in_content and not line.strip():
-                        continue
-                    # Start capturing after the first non-empty, non-Python line
-                    if not in_content and line.strip() and not line.strip().startswith('#'):
-                        in_content = True
-                    if in_content:
-                        content_lines.append(line)
-                
-                if content_lines:
-                    cleaned_content = '\n'.join(content_lines).strip()
+                cleaned_content = _PYTHON_LINE_RE.sub("", cleaned_content).strip()
             
             # Write the cleaned content to file
             with open(rca_filepath, 'w', encoding='utf-8') as f:
@@ -126,64 +145,37 @@ class AgentOrchestrator:
             print(f"❌ Error saving RCA report: {str(e)}")
             return None
 
-    async def process_network_incident(self, log_file_path):
-        # Read the actual log content
-        log_content = self.read_log_file(log_file_path)
-        
-        # Format the prompts with log content
-        severity_prompt = SEVERITY_CLASSIFIER_INSTRUCTIONS.format(log_content=log_content)
-        rca_prompt = ROOT_CAUSE_ANALYSIS_INSTRUCTIONS.format(
-            log_content=log_content,
-            severity_classification="To be determined"
-        )
-        
-        # Create agents with formatted prompts
-        severity_agent = self.kernel.add_function(
-            plugin_name="network_agents",
-            function_name=SEVERITY_CLASSIFIER,
-            prompt=severity_prompt,
-            prompt_execution_settings=PromptExecutionSettings(max_tokens=2000, temperature=0.7)
-        )
-        
-        # 1. Severity Classification
+    async def _severity(self, log_file_path, log_content):
+        """Classify incident severity for one log and notify Slack."""
         severity_response = await self.kernel.invoke(
             plugin_name="network_agents",
             function_name=SEVERITY_CLASSIFIER,
-            arguments=KernelArguments()
+            arguments=KernelArguments(log_content=log_content)
         )
 
         # Send severity notification
-        self.slack.send_notification(
+        self.notify(
             "Network incident severity classified",
             {
                 "Log File": os.path.basename(log_file_path),
                 "Severity": str(severity_response)
             }
         )
+        return severity_response
 
-        # Update RCA prompt with actual severity classification
-        rca_prompt = ROOT_CAUSE_ANALYSIS_INSTRUCTIONS.format(
-            log_content=log_content,
-            severity_classification=str(severity_response)
-        )
-        
-        # Create RCA agent with updated prompt
-        rca_agent = self.kernel.add_function(
-            plugin_name="network_agents",
-            function_name=ROOT_CAUSE_ANALYSIS,
-            prompt=rca_prompt,
-            prompt_execution_settings=PromptExecutionSettings(max_tokens=2000, temperature=0.7)
-        )
-
-        # 2. RCA Agent generates analysis report
+    async def _rca(self, log_file_path, log_content, severity_response):
+        """Generate, announce and save the RCA report for one log."""
         rca_response = await self.kernel.invoke(
             plugin_name="network_agents",
             function_name=ROOT_CAUSE_ANALYSIS,
-            arguments=KernelArguments()
+            arguments=KernelArguments(
+                log_content=log_content,
+                severity_classification=str(severity_response)
+            )
         )
 
         # Send RCA notification
-        self.slack.send_notification(
+        self.notify(
             "Root Cause Analysis completed",
             {
                 "RCA Summary": str(rca_response)[:500] + "..."  # Truncate for Slack
@@ -191,9 +183,68 @@ class AgentOrchestrator:
         )
 
         # Save RCA report to file
-        rca_filepath = self.save_rca_report(log_file_path, rca_response)
+        await asyncio.to_thread(self.save_rca_report, log_file_path, rca_response)
+        return rca_response
+
+    async def process_network_incident(self, log_file_path):
+        # Read the actual log content off the event loop
+        log_content = await asyncio.to_thread(self.read_log_file, log_file_path)
+        log_content = self.condense_log(log_content)
+
+        # 1. Severity Classification
+        severity_response = await self._severity(log_file_path, log_content)
+
+        # 2. RCA Agent generates analysis report
+        rca_response = await self._rca(log_file_path, log_content, severity_response)
 
         return {
             "severity_response": str(severity_response),
             "rca_response": str(rca_response)
         }
+
+    async def process_incidents(self, log_file_paths):
+        """
+        Process many incidents concurrently: all severity classifications are
+        issued together, then all RCA generations. Concurrency is capped at
+        CONCURRENCY (default 8) to respect Azure OpenAI rate limits.
+        Returns one result dict per path, in order; failed logs get {"error": ...}.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_llm_calls)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        log_contents = await asyncio.gather(
+            *[asyncio.to_thread(self.read_log_file, p) for p in log_file_paths],
+            return_exceptions=True
+        )
+        # Failures are reported per log, like read errors, instead of aborting the batch
+        results = {
+            p: {"error": f"Error reading log file: {c}"}
+            for p, c in zip(log_file_paths, log_contents) if isinstance(c, Exception)
+        }
+        readable = [
+            (p, self.condense_log(c)) for p, c in zip(log_file_paths, log_contents)
+            if not isinstance(c, Exception)
+        ]
+        severities = await asyncio.gather(
+            *[bounded(self._severity(p, c)) for p, c in readable],
+            return_exceptions=True
+        )
+        classified = []
+        for (p, c), sev in zip(readable, severities):
+            if isinstance(sev, Exception):
+                results[p] = {"error": f"Error classifying severity: {sev}"}
+            else:
+                classified.append((p, c, sev))
+        rcas = await asyncio.gather(
+            *[bounded(self._rca(p, c, sev)) for p, c, sev in classified],
+            return_exceptions=True
+        )
+        for (p, _, sev), rca in zip(classified, rcas):
+            if isinstance(rca, Exception):
+                results[p] = {"error": f"Error generating RCA: {rca}"}
+            else:
+                results[p] = {"severity_response": str(sev), "rca_response": str(rca)}
+        return [results[p] for p in log_file_paths]
@@ -1,6 +1,7 @@
 """
 prompts.py: Defines agent names and instruction templates for SEVERITY_CLASSIFIER and ROOT_CAUSE_ANALYSIS.
 Prompts embed log_content and severity to drive deterministic, structured outputs.
+Placeholders use Semantic Kernel template syntax ({{$var}}) and are filled from KernelArguments at invoke time.
 """
 
 # =========================
@@ -33,7 +34,7 @@ ANALYSIS CRITERIA:
 - Duration and persistence of issues
 
 LOG CONTENT TO ANALYZE:
-{log_content}
+{{$log_content}}
 
 FORMAT:
 - Analyze the log content above
@@ -52,10 +53,10 @@ You are the Root Cause Analysis (RCA) Agent.
 Analyze the following log content and severity classification to produce an RCA report:
 
 LOG CONTENT:
-{log_content}
+{{$log_content}}
 
 SEVERITY CLASSIFICATION:
-{severity_classification}
+{{$severity_classification}}
 
 TASKS:
 1) Analyze the log content above
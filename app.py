@@ -1,4 +1,7 @@
 import os
+import re
+import json
+import heapq
 import streamlit as st
 from dotenv import load_dotenv
 from storage.rca_vector_store import RCAVectorStore
@@ -12,10 +15,22 @@ load_dotenv(override=True)
 # Directories
 LOGS_DIR = os.path.join(os.getcwd(), "logs")
 RCA_DIR = os.path.join(os.getcwd(), "rca_reports")
+INDEX_MANIFEST = os.path.join(RCA_DIR, ".indexed.json")
+
+# Fault categories matched case-insensitively in a single pass over each RCA report
+FAULT_CATEGORIES = ("Network", "Hardware", "Software")
+FAULT_CATEGORY_RE = re.compile(rb"network|hardware|software", re.IGNORECASE)
+
+# Log Processor and Vector Store are created lazily, once per server process
+@st.cache_resource
+def get_log_processor():
+    return LogProcessor()
+
+
+@st.cache_resource
+def get_vector_store():
+    return RCAVectorStore()
 
-# Initialize Log Processor and Vector Store
-log_processor = LogProcessor()
-vector_store = RCAVectorStore()
 
 # Streamlit page config
 st.set_page_config(
@@ -32,31 +47,103 @@ page = st.sidebar.radio(
 )
 
 
+# ------------------- CACHED HELPERS -------------------
+@st.cache_data(ttl=5)
+def rca_fingerprint():
+    """
+    (name, mtime_ns, size) of every RCA report; changes whenever a report does.
+    One scandir pass shared by all tabs, refreshed at most every 5 seconds.
+    """
+    if not os.path.exists(RCA_DIR):
+        return ()
+    entries = []
+    with os.scandir(RCA_DIR) as it:
+        for e in it:
+            if e.name.endswith(".txt"):
+                stat = e.stat()
+                entries.append((e.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+@st.cache_data
+def compute_fault_counts(fingerprint):
+    """Count RCA reports per fault category; cached until the fingerprint changes."""
+    fault_counts = {}
+    for name, _, _ in fingerprint:
+        with open(os.path.join(RCA_DIR, name), "rb") as f:
+            content = f.read()
+        found = {m.group(0).lower() for m in FAULT_CATEGORY_RE.finditer(content)}
+        for label in FAULT_CATEGORIES:
+            if label.lower().encode() in found:
+                fault_counts[label] = fault_counts.get(label, 0) + 1
+    return fault_counts
+
+
+@st.cache_data
+def load_report_previews(fingerprint, limit=5):
+    """Return (name, preview) for the newest reports; cached until the fingerprint changes."""
+    previews = []
+    for name, _, _ in heapq.nlargest(limit, fingerprint, key=lambda e: e[0]):
+        with open(os.path.join(RCA_DIR, name), "r", encoding="utf-8") as f:
+            previews.append((name, f.read(500)))
+    return previews
+
+
+def index_changed_reports():
+    """
+    Push only new or modified RCA reports to Pinecone.
+    Indexed reports are tracked as {filename: mtime_ns} in INDEX_MANIFEST.
+    """
+    manifest = {}
+    if os.path.exists(INDEX_MANIFEST):
+        try:
+            with open(INDEX_MANIFEST, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+    fingerprint = rca_fingerprint()
+    if not fingerprint:
+        return "⚠️ No RCA reports found to index."
+
+    changed = [(name, mtime) for name, mtime, _ in fingerprint if manifest.get(name) != mtime]
+    if not changed:
+        return "✅ All RCA reports are already indexed."
+
+    result = get_vector_store().chunk_and_store_reports(RCA_DIR, files=[name for name, _ in changed])
+    # Reports that failed stay out of the manifest so the next run retries them
+    indexed = set(result["indexed"])
+    if indexed:
+        manifest.update((name, mtime) for name, mtime in changed if name in indexed)
+        with open(INDEX_MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+    return result["message"]
+
+
 # ------------------- RCA MANAGEMENT TAB -------------------
 def render_rca_management():
     st.title("🧠 RCA Management")
     st.write("Logs are automatically processed and indexed into Pinecone.")
 
     # 1. Process logs into RCA reports automatically
-    reports_generated = log_processor.process_logs(LOGS_DIR, RCA_DIR)
+    reports_generated = get_log_processor().process_logs(LOGS_DIR, RCA_DIR)
 
     if reports_generated:
+        rca_fingerprint.clear()
         st.success(f"✅ {reports_generated} new RCA reports generated!")
     else:
         st.info("No new logs found to process.")
 
-    # 2. Auto-chunk RCA reports and push to Pinecone
-    msg = vector_store.chunk_and_store_reports(RCA_DIR)
+    # 2. Auto-chunk new or changed RCA reports and push to Pinecone
+    msg = index_changed_reports()
     st.info(msg)
 
     # 3. Show RCA reports preview
     st.subheader("📄 Recent RCA Reports")
     if os.path.exists(RCA_DIR):
-        reports = sorted(os.listdir(RCA_DIR), reverse=True)
-        for report in reports[:5]:
-            with open(os.path.join(RCA_DIR, report), "r", encoding="utf-8") as f:
-                st.markdown(f"**{report}**")
-                st.code(f.read()[:500] + " ...")
+        for name, preview in load_report_previews(rca_fingerprint()):
+            st.markdown(f"**{name}**")
+            st.code(preview + " ...")
     else:
         st.warning("No RCA reports found yet!")
 
@@ -68,6 +155,7 @@ def render_rca_search():
 
     if query:
         try:
+            vector_store = get_vector_store()
             rag = vector_store.answer_query(query, top_k=5)
             st.subheader("🧠 Consolidated Answer")
             st.write(rag.get("answer", ""))
@@ -95,21 +183,12 @@ def render_analytics():
     st.title("📊 RCA Analytics Dashboard")
 
     # Generate a mock summary from RCA reports
-    if not os.path.exists(RCA_DIR) or len(os.listdir(RCA_DIR)) == 0:
+    fingerprint = rca_fingerprint()
+    if not fingerprint:
         st.warning("No RCA reports available for analytics.")
         return
 
-    fault_counts = {}
-    for file in os.listdir(RCA_DIR):
-        if file.endswith(".txt"):
-            with open(os.path.join(RCA_DIR, file), "r", encoding="utf-8") as f:
-                content = f.read()
-                if "network" in content.lower():
-                    fault_counts["Network"] = fault_counts.get("Network", 0) + 1
-                if "hardware" in content.lower():
-                    fault_counts["Hardware"] = fault_counts.get("Hardware", 0) + 1
-                if "software" in content.lower():
-                    fault_counts["Software"] = fault_counts.get("Software", 0) + 1
+    fault_counts = compute_fault_counts(fingerprint)
 
     if not fault_counts:
         st.info("No specific fault categories detected in RCA reports.")
@@ -1,26 +1,49 @@
 import os
-import json
+import orjson
 import time
+import heapq
 import asyncio
 from collections import defaultdict
-from kafka import KafkaConsumer
+from aiokafka import AIOKafkaConsumer
 from dotenv import load_dotenv
 
 from agents.agent_orchestrator import AgentOrchestrator
+from utils.helpers import append_text
 
 TOPIC = os.getenv("KAFKA_TOPIC", "network-logs")
 BROKER = os.getenv("KAFKA_BROKER", "localhost:9092")
+# Offsets are committed manually, which requires a consumer group
+GROUP_ID = os.getenv("KAFKA_GROUP_ID", "rca-consumer")
 OUT_DIR = os.getenv("STREAM_LOG_DIR", os.path.join(os.getcwd(), "logs", "ingested"))
 DEBOUNCE_SEC = float(os.getenv("DEBOUNCE_SEC", "5"))
+MAX_RECORDS = int(os.getenv("KAFKA_MAX_RECORDS", "1000"))
+FLUSH_BYTES = int(os.getenv("STREAM_FLUSH_BYTES", str(64 * 1024)))
+MAX_CONCURRENT_INCIDENTS = int(os.getenv("MAX_CONCURRENT_INCIDENTS", "4"))
 
-last_seen = defaultdict(float)
-pending_tasks = {}
+# Debounce deadlines as a min-heap of (fire_at, version, path); an entry is
+# stale once a newer message for the same path has bumped its version
+deadlines = []
+version = defaultdict(int)
+# Files queued or being processed; a file is never queued twice
+in_flight = set()
+# Lines received but not yet written, per output file; drained before each offset commit
+pending_lines = defaultdict(list)
+pending_bytes = defaultdict(int)
+# Directories already created, so makedirs runs once per directory
+_created_dirs = set()
 
 
-def append_line(path: str, line: str) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+def flush(path: str) -> None:
+    """Append all buffered lines for path in a single write."""
+    buf = pending_lines.pop(path, None)
+    pending_bytes.pop(path, None)
+    if not buf:
+        return
+    dirname = os.path.dirname(path)
+    if dirname not in _created_dirs:
+        os.makedirs(dirname, exist_ok=True)
+        _created_dirs.add(dirname)
+    append_text(path, "\n".join(buf) + "\n")
 
 
 async def process_file(orch: AgentOrchestrator, path: str) -> None:
@@ -31,41 +54,93 @@ async def process_file(orch: AgentOrchestrator, path: str) -> None:
         print(f"[Error] {path}: {e}")
 
 
-async def debounce_loop(orch: AgentOrchestrator) -> None:
+async def worker(orch: AgentOrchestrator, queue: asyncio.Queue) -> None:
     while True:
-        now = time.time()
-        for filepath, ts in list(last_seen.items()):
-            if now - ts >= DEBOUNCE_SEC and filepath not in pending_tasks:
-                pending_tasks[filepath] = asyncio.create_task(process_file(orch, filepath))
-        # cleanup finished tasks
-        for fp, t in list(pending_tasks.items()):
-            if t.done():
-                pending_tasks.pop(fp, None)
-        await asyncio.sleep(1)
+        filepath = await queue.get()
+        try:
+            await process_file(orch, filepath)
+        finally:
+            in_flight.discard(filepath)
+            queue.task_done()
+
+
+async def debounce_loop(queue: asyncio.Queue) -> None:
+    while True:
+        now = time.monotonic()
+        while deadlines and deadlines[0][0] <= now:
+            _, v, filepath = heapq.heappop(deadlines)
+            if v != version[filepath]:
+                continue
+            if filepath in in_flight:
+                # still processing the previous batch; check again later
+                heapq.heappush(deadlines, (now + DEBOUNCE_SEC, v, filepath))
+                continue
+            flush(filepath)
+            in_flight.add(filepath)
+            queue.put_nowait(filepath)
+        # a new arrival fires no sooner than DEBOUNCE_SEC from now
+        await asyncio.sleep(deadlines[0][0] - now if deadlines else DEBOUNCE_SEC)
+
+
+async def consume(consumer: AIOKafkaConsumer) -> None:
+    while True:
+        records = await consumer.getmany(timeout_ms=200, max_records=MAX_RECORDS)
+        touched = set()
+        for tp, msgs in records.items():
+            for msg in msgs:
+                source = msg.key or "unknown.log"
+                data = msg.value
+                line = data.get("line", "")
+                out_path = os.path.join(OUT_DIR, f"stream_{source}")
+                pending_lines[out_path].append(line)
+                pending_bytes[out_path] += len(line) + 1
+                if pending_bytes[out_path] >= FLUSH_BYTES:
+                    flush(out_path)
+                touched.add(out_path)
+        if not records:
+            continue
+        # Lines must be on disk before their offsets are committed, otherwise a
+        # crash would lose them for good; one write per file per batch
+        for out_path in touched:
+            flush(out_path)
+        # one offset commit per batch instead of timer-driven auto-commit
+        await consumer.commit()
+        # one deadline per file per batch, not per message
+        fire_at = time.monotonic() + DEBOUNCE_SEC
+        for out_path in touched:
+            version[out_path] += 1
+            heapq.heappush(deadlines, (fire_at, version[out_path], out_path))
 
 
 async def main() -> None:
     load_dotenv(override=True)
     orch = AgentOrchestrator()
-    consumer = KafkaConsumer(
+    consumer = AIOKafkaConsumer(
         TOPIC,
-        bootstrap_servers=[BROKER],
-        value_deserializer=lambda v: json.loads(v.decode("utf-8")),
+        bootstrap_servers=BROKER,
+        group_id=GROUP_ID,
+        value_deserializer=orjson.loads,
         key_deserializer=lambda k: k.decode("utf-8") if k else None,
-        enable_auto_commit=True,
+        enable_auto_commit=False,
+        max_poll_records=MAX_RECORDS,
         auto_offset_reset="earliest",
+        fetch_min_bytes=65536,
+        fetch_max_wait_ms=200,
+        max_partition_fetch_bytes=5 * 1024 * 1024,
     )
-    asyncio.create_task(debounce_loop(orch))
-    for msg in consumer:
-        source = msg.key or "unknown.log"
-        data = msg.value
-        line = data.get("line", "")
-        out_path = os.path.join(OUT_DIR, f"stream_{source}")
-        append_line(out_path, line)
-        last_seen[out_path] = time.time()
+    await consumer.start()
+    try:
+        # A fixed pool of workers caps concurrent incidents hitting the LLM API
+        queue = asyncio.Queue()
+        workers = [worker(orch, queue) for _ in range(MAX_CONCURRENT_INCIDENTS)]
+        await asyncio.gather(debounce_loop(queue), consume(consumer), *workers)
+    finally:
+        # Write out anything still buffered before shutting down
+        for path in list(pending_lines):
+            flush(path)
+        await consumer.stop()
+        await orch.drain_notifications()
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
@@ -1,6 +1,6 @@
 import os
 import time
-import json
+import orjson
 from kafka import KafkaProducer
 
 TOPIC = os.getenv("KAFKA_TOPIC", "network-logs")
@@ -11,26 +11,37 @@ LOOP = os.getenv("LOOP", "1") == "1"
 
 
 def iter_log_lines():
-    for fname in sorted(os.listdir(LOGS_DIR)):
-        if fname.endswith(".txt"):
-            with open(os.path.join(LOGS_DIR, fname), "r", encoding="utf-8") as f:
-                for line in f:
-                    yield fname, line.rstrip("\n")
+    with os.scandir(LOGS_DIR) as it:
+        entries = sorted((e for e in it if e.name.endswith(".txt")), key=lambda e: e.name)
+    for entry in entries:
+        # Binary mode with a large buffer: fewer read syscalls, no newline translation
+        with open(entry.path, "rb", buffering=1 << 20) as f:
+            for raw in f:
+                yield entry.name, raw.rstrip(b"\r\n").decode("utf-8")
 
 
 def main():
     producer = KafkaProducer(
         bootstrap_servers=[BROKER],
-        value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-        key_serializer=lambda k: k.encode("utf-8"),
-        linger_ms=50,
+        value_serializer=orjson.dumps,
+        linger_ms=100,
+        batch_size=64000,
+        compression_type="lz4",
+        acks=1,
+        max_in_flight_requests_per_connection=5,
     )
+    # Keys are encoded once per file rather than once per line
+    key_cache = {}
     try:
         while True:
             for fname, line in iter_log_lines():
+                key = key_cache.get(fname)
+                if key is None:
+                    key = key_cache[fname] = fname.encode("utf-8")
                 msg = {"source": fname, "line": line, "ts": time.time()}
-                producer.send(TOPIC, key=fname, value=msg)
-                time.sleep(SLEEP_BETWEEN_LINES)
+                producer.send(TOPIC, key=key, value=msg)
+                if SLEEP_BETWEEN_LINES > 0:
+                    time.sleep(SLEEP_BETWEEN_LINES)
             if not LOOP:
                 break
     finally:
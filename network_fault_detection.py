@@ -1,7 +1,10 @@
 import asyncio
 import os
+import re
+import sys
 import textwrap
-import json
+import time
+import orjson
 import aiohttp
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +21,8 @@ from semantic_kernel.contents.chat_message_content import ChatMessageContent
 from semantic_kernel.contents.utils.author_role import AuthorRole
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
+from utils.helpers import append_text, write_text, ts
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -139,64 +144,146 @@ LOGS_DIR = SCRIPT_DIR / "logs"
 RCA_DIR = SCRIPT_DIR / "rca_reports"
 RCA_DIR.mkdir(exist_ok=True)
 
+# =========================
+# Background Tasks
+# =========================
+# Strong references keep fire-and-forget tasks from being garbage-collected mid-flight
+_bg_tasks: set[asyncio.Task] = set()
+
+def _on_bg_task_done(task: asyncio.Task) -> None:
+    _bg_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Background task failed: {task.exception()!r}")
+
+def _spawn(coro) -> asyncio.Task:
+    """Start a background task that is tracked and whose errors are logged"""
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_on_bg_task_done)
+    return task
+
 # =========================
 # Slack Notification Helper
 # =========================
 class SlackNotifier:
+    # Notifications arriving within this window are sent as one Slack message
+    BATCH_WINDOW_SEC = 2.0
+    # Slack accepts at most 100 attachments per message
+    MAX_ATTACHMENTS = 100
+
+    # Payload pieces shared by every notification, built once
+    _FOOTER = "Network Fault Detection System"
+    _HDRS = {"Content-Type": "application/json"}
+    _SEV_COLOR = {"P1": "danger", "P2": "warning", "P3": "good"}
+    _SEV_EMOJI = {"P1": "🔴", "P2": "🟡", "P3": "🟢"}
+    _SEV_DESC = {
+        "P1": "Critical - Complete outage or high revenue impact",
+        "P2": "Major - Service degradation affecting many customers",
+        "P3": "Minor - Isolated issue or early warning"
+    }
+
     def __init__(self, webhook_url: str):
         self.webhook_url = webhook_url
         self.enabled = bool(webhook_url)
+        self._session: aiohttp.ClientSession | None = None
+        # Notifications waiting to be batched into one webhook call
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._flusher_task: asyncio.Task | None = None
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Lazily create one keep-alive session reused for every webhook call"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
+        return self._session
+
+    async def close(self):
+        """Flush queued notifications, then close the shared HTTP session"""
+        if self._flusher_task is not None:
+            self._queue.put_nowait(None)  # sentinel: post what is queued and stop
+            await self._flusher_task
+            self._flusher_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
     
-    async def send_notification(self, message: str, color: str = "good", title: str = None):
-        """Send a notification to Slack using webhook"""
+    def send_notification(self, message: str, color: str = "good", title: str = None):
+        """Queue a notification; queued notifications are posted to Slack in batches"""
         if not self.enabled:
             print("Slack webhook not configured - skipping notification")
             return
         
+        self._queue.put_nowait({
+            "color": color,
+            "title": title or "Network Operations Alert",
+            "text": message,
+            "footer": self._FOOTER,
+            "ts": int(time.time())
+        })
+        if self._flusher_task is None:
+            self._flusher_task = _spawn(self._flusher())
+
+    async def _flusher(self):
+        """Collect notifications for up to BATCH_WINDOW_SEC and post them as one message"""
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stop = False
+            deadline = loop.time() + self.BATCH_WINDOW_SEC
+            while len(batch) < self.MAX_ATTACHMENTS:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            await self._post(batch)
+            if stop:
+                return
+
+    async def _post(self, attachments):
+        """Send a batch of attachments to Slack using webhook"""
         try:
-            payload = {
-                "attachments": [
-                    {
-                        "color": color,
-                        "title": title or "Network Operations Alert",
-                        "text": message,
-                        "footer": "Network Fault Detection System",
-                        "ts": int(datetime.now().timestamp())
-                    }
-                ]
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    if response.status == 200:
-                        print("✓ Slack notification sent successfully")
-                    else:
-                        print(f"✗ Slack notification failed: {response.status}")
+            session = await self._ensure_session()
+            async with session.post(
+                self.webhook_url,
+                data=orjson.dumps({"attachments": attachments}),
+                headers=self._HDRS
+            ) as response:
+                if response.status == 200:
+                    print(f"✓ Slack notification sent successfully ({len(attachments)} message(s))")
+                else:
+                    print(f"✗ Slack notification failed: {response.status}")
                         
         except Exception as e:
             print(f"Error sending Slack notification: {e}")
 
-    async def send_incident_detected(self, logfile: str, action: str, severity: str = None):
+    def send_incident_detected(self, logfile: str, action: str, severity: str = None):
         """Send notification when incident is detected"""
-        severity_emoji = {"P1": "🔴", "P2": "🟡", "P3": "🟢"}.get(severity, "🚨")
+        severity_emoji = self._SEV_EMOJI.get(severity, "🚨")
         severity_text = f"\n**Severity:** {severity_emoji} {severity}" if severity else ""
         
-        await self.send_notification(
+        self.send_notification(
             message=f"🚨 **Incident Detected**\n"
-                   f"**Log File:** `{Path(logfile).name}`\n"
+                   f"**Log File:** `{os.path.basename(logfile)}`\n"
                    f"**Recommended Action:** {action}{severity_text}\n"
                    f"**Time:** {ts()}",
-            color="danger" if severity == "P1" else "warning" if severity == "P2" else "good",
+            color=self._SEV_COLOR.get(severity, "good"),
             title="Network Incident Detected"
         )
     
-    async def send_action_taken(self, action: str, result: str):
+    def send_action_taken(self, action: str, result: str):
         """Send notification when corrective action is taken"""
-        await self.send_notification(
+        self.send_notification(
             message=f"🔧 **Corrective Action Taken**\n"
                    f"**Action:** {action}\n"
                    f"**Result:** {result}\n"
@@ -205,40 +292,37 @@ class SlackNotifier:
             title="Network Action Executed"
         )
     
-    async def send_severity_classification(self, logfile: str, severity: str):
+    def send_severity_classification(self, logfile: str, severity: str):
         """Send notification when severity is classified"""
-        severity_emoji = {"P1": "🔴", "P2": "🟡", "P3": "🟢"}.get(severity, "❓")
-        severity_desc = {
-            "P1": "Critical - Complete outage or high revenue impact", 
-            "P2": "Major - Service degradation affecting many customers",
-            "P3": "Minor - Isolated issue or early warning"
-        }.get(severity, "Unknown severity")
-        
-        color = "danger" if severity == "P1" else "warning" if severity == "P2" else "good"
+        severity_emoji = self._SEV_EMOJI.get(severity, "❓")
+        severity_desc = self._SEV_DESC.get(severity, "Unknown severity")
+        color = self._SEV_COLOR.get(severity, "good")
         
-        await self.send_notification(
+        self.send_notification(
             message=f"📊 **Incident Severity Classified**\n"
-                   f"**Log File:** `{Path(logfile).name}`\n"
+                   f"**Log File:** `{os.path.basename(logfile)}`\n"
                    f"**Severity:** {severity_emoji} **{severity}** - {severity_desc}\n"
                    f"**Time:** {ts()}",
             color=color,
             title="Severity Assessment Completed"
         )
+
+    def send_rca_completed(self, logfile: str, rca_path: str):
         """Send notification when RCA is completed"""
-        await self.send_notification(
+        self.send_notification(
             message=f"📋 **RCA Report Generated**\n"
-                   f"**Incident:** `{Path(logfile).name}`\n"
-                   f"**RCA Report:** `{Path(rca_path).name}`\n"
+                   f"**Incident:** `{os.path.basename(logfile)}`\n"
+                   f"**RCA Report:** `{os.path.basename(rca_path)}`\n"
                    f"**Time:** {ts()}",
             color="good",
             title="RCA Report Completed"
         )
     
-    async def send_incident_resolved(self, logfile: str):
+    def send_incident_resolved(self, logfile: str):
         """Send notification when incident is resolved"""
-        await self.send_notification(
+        self.send_notification(
             message=f"✅ **Incident Resolved**\n"
-                   f"**Log File:** `{Path(logfile).name}`\n"
+                   f"**Log File:** `{os.path.basename(logfile)}`\n"
                    f"**Status:** Network stabilized, no further action needed\n"
                    f"**Time:** {ts()}",
             color="good",
@@ -256,8 +340,13 @@ print("Has send_rca_completed:", hasattr(slack_notifier, 'send_rca_completed'))
 # MAIN
 # =========================
 async def main():
-    # Clear console
-    os.system('cls' if os.name=='nt' else 'clear')
+    # Clear console with ANSI escapes instead of spawning a shell; classic
+    # conhost/PowerShell 5 do not process VT sequences by default, so use cls there
+    if sys.stdout.isatty():
+        if os.name == "nt":
+            os.system("cls")
+        else:
+            print("\x1b[2J\x1b[H", end="", flush=True)
 
     # Validate logs directory
     if not LOGS_DIR.exists():
@@ -272,97 +361,105 @@ async def main():
         print("✓ Slack notifications enabled")
         print(f"✓ Webhook URL loaded: {SLACK_WEBHOOK_URL[:50]}...")  # Show first 50 chars for verification
 
-    # Azure AI Agent settings (AZURE_OPENAI_* from env)
-    ai_agent_settings = AzureAIAgentSettings()
-
-    async with (
-        DefaultAzureCredential(
-            exclude_environment_credential=True,
-            exclude_managed_identity_credential=True
-        ) as creds,
-        AzureAIAgent.create_client(credential=creds) as client,
-    ):
-        # Create agents in Azure AI Agent Service
-        incident_agent_definition = await client.agents.create_agent(
-            model=ai_agent_settings.model_deployment_name,
-            name=INCIDENT_MANAGER,
-            instructions=INCIDENT_MANAGER_INSTRUCTIONS
-        )
-        agent_incident = AzureAIAgent(
-            client=client,
-            definition=incident_agent_definition,
-            plugins=[LogFilePlugin()]  # read_log_file
-        )
-
-        ops_agent_definition = await client.agents.create_agent(
-            model=ai_agent_settings.model_deployment_name,
-            name=NETWORK_OPS_ASSISTANT,
-            instructions=NETWORK_OPS_ASSISTANT_INSTRUCTIONS
-        )
-        agent_ops = AzureAIAgent(
-            client=client,
-            definition=ops_agent_definition,
-            plugins=[NetworkOpsPlugin()]  # executes actions + appends to logs
-        )
+    # Shared so pending RCA writes can be flushed on shutdown
+    rca_saver = RCASaverPlugin()
+
+    try:
+        # Azure AI Agent settings (AZURE_OPENAI_* from env)
+        ai_agent_settings = AzureAIAgentSettings()
+
+        async with (
+            DefaultAzureCredential(
+                exclude_environment_credential=True,
+                exclude_managed_identity_credential=True
+            ) as creds,
+            AzureAIAgent.create_client(credential=creds) as client,
+        ):
+            # Create agents in Azure AI Agent Service
+            incident_agent_definition = await client.agents.create_agent(
+                model=ai_agent_settings.model_deployment_name,
+                name=INCIDENT_MANAGER,
+                instructions=INCIDENT_MANAGER_INSTRUCTIONS
+            )
+            agent_incident = AzureAIAgent(
+                client=client,
+                definition=incident_agent_definition,
+                plugins=[LogFilePlugin()]  # read_log_file
+            )
 
-        severity_agent_definition = await client.agents.create_agent(
-            model=ai_agent_settings.model_deployment_name,
-            name=SEVERITY_CLASSIFIER,
-            instructions=SEVERITY_CLASSIFIER_INSTRUCTIONS
-        )
-        agent_severity = AzureAIAgent(
-            client=client,
-            definition=severity_agent_definition,
-            plugins=[LogFilePlugin()]  # read_log_file for severity assessment
-        )
+            ops_agent_definition = await client.agents.create_agent(
+                model=ai_agent_settings.model_deployment_name,
+                name=NETWORK_OPS_ASSISTANT,
+                instructions=NETWORK_OPS_ASSISTANT_INSTRUCTIONS
+            )
+            agent_ops = AzureAIAgent(
+                client=client,
+                definition=ops_agent_definition,
+                plugins=[NetworkOpsPlugin()]  # executes actions + appends to logs
+            )
 
-        rca_agent_definition = await client.agents.create_agent(
-            model=ai_agent_settings.model_deployment_name,
-            name=ROOT_CAUSE_ANALYSIS,
-            instructions=ROOT_CAUSE_ANALYSIS_INSTRUCTIONS
-        )
-        agent_rca = AzureAIAgent(
-            client=client,
-            definition=rca_agent_definition,
-            plugins=[LogFilePlugin(), RCASaverPlugin()]  # read + save RCA
-        )
+            severity_agent_definition = await client.agents.create_agent(
+                model=ai_agent_settings.model_deployment_name,
+                name=SEVERITY_CLASSIFIER,
+                instructions=SEVERITY_CLASSIFIER_INSTRUCTIONS
+            )
+            agent_severity = AzureAIAgent(
+                client=client,
+                definition=severity_agent_definition,
+                plugins=[LogFilePlugin()]  # read_log_file for severity assessment
+            )
 
-        # Group chat with custom selection + termination
-        chat = AgentGroupChat(
-            agents=[agent_incident, agent_ops, agent_severity, agent_rca],
-            termination_strategy=StabilizationOrSavedTerminationStrategy(
-                agents=[agent_incident, agent_rca],
-                maximum_iterations=16,
-                automatic_reset=True
-            ),
-            selection_strategy=FourAgentTurnTaking(agents=[agent_incident, agent_ops, agent_severity, agent_rca]),
-        )
+            rca_agent_definition = await client.agents.create_agent(
+                model=ai_agent_settings.model_deployment_name,
+                name=ROOT_CAUSE_ANALYSIS,
+                instructions=ROOT_CAUSE_ANALYSIS_INSTRUCTIONS
+            )
+            agent_rca = AzureAIAgent(
+                client=client,
+                definition=rca_agent_definition,
+                plugins=[LogFilePlugin(), rca_saver]  # read + save RCA
+            )
 
-        # Process each log file independently
-        for filename in sorted(LOGS_DIR.glob("*.txt")):
-            logfile_msg = ChatMessageContent(
-                role=AuthorRole.USER,
-                content=f"USER > {filename}"
+            # Group chat with custom selection + termination
+            chat = AgentGroupChat(
+                agents=[agent_incident, agent_ops, agent_severity, agent_rca],
+                termination_strategy=StabilizationOrSavedTerminationStrategy(
+                    agents=[agent_incident, agent_rca],
+                    maximum_iterations=16,
+                    automatic_reset=True
+                ),
+                selection_strategy=FourAgentTurnTaking(agents=[agent_incident, agent_ops, agent_severity, agent_rca]),
             )
-            print(f"\n=== Ready to process: {filename.name} ===\n")
-            await chat.add_chat_message(logfile_msg)
 
-            try:
-                async for response in chat.invoke():  # multi-turn conversation
-                    if response is None or not response.name:
+            # Process each log file independently
+            for filename in sorted(LOGS_DIR.glob("*.txt")):
+                logfile_msg = ChatMessageContent(
+                    role=AuthorRole.USER,
+                    content=f"USER > {filename}"
+                )
+                print(f"\n=== Ready to process: {filename.name} ===\n")
+                await chat.add_chat_message(logfile_msg)
+
+                try:
+                    async for response in chat.invoke():  # multi-turn conversation
+                        if response is None or not response.name:
+                            continue
+                        print(response.content)
+                except Exception as e:
+                    print(f"Error during chat invocation: {e}")
+                    if "Rate limit is exceeded" in str(e):
+                        print("Hit rate limit. Cooling down 60s...")
+                        await asyncio.sleep(60)
                         continue
-                    print(response.content)
-            except Exception as e:
-                print(f"Error during chat invocation: {e}")
-                if "Rate limit is exceeded" in str(e):
-                    print("Hit rate limit. Cooling down 60s...")
-                    await asyncio.sleep(60)
-                    continue
-                else:
-                    break
+                    else:
+                        break
 
-            # small pause to avoid TPM spikes
-            await asyncio.sleep(2)
+                # small pause to avoid TPM spikes
+                await asyncio.sleep(2)
+    finally:
+        # Finish pending RCA writes, then release the pooled Slack connection
+        await rca_saver.close()
+        await slack_notifier.close()
 
 # =========================
 # Selection Strategy (4-agent)
@@ -391,6 +488,10 @@ class FourAgentTurnTaking(SequentialSelectionStrategy):
 # =========================
 # Termination Strategy
 # =========================
+TERMINATION_AGENTS = frozenset({INCIDENT_MANAGER, SEVERITY_CLASSIFIER, ROOT_CAUSE_ANALYSIS})
+TERMINATION_RE = re.compile(r"no action needed|rca_saved|stabilized|recovered|normalized", re.IGNORECASE)
+TERMINATION_TAIL_CHARS = 256
+
 class StabilizationOrSavedTerminationStrategy(TerminationStrategy):
     """
     Stop when either:
@@ -398,34 +499,37 @@ class StabilizationOrSavedTerminationStrategy(TerminationStrategy):
       - The RCA agent reports the RCA file saved (exact token 'RCA_SAVED').
     """
     async def should_agent_terminate(self, agent, history):
-        last = history[-1].content.strip().lower()
+        if agent.name not in TERMINATION_AGENTS:
+            return False
+        content = history[-1].content
         
         # Check if severity classifier responded and send notification
-        if agent.name == SEVERITY_CLASSIFIER and last in ["p1", "p2", "p3"]:
-            severity = last.upper()
-            # Find the logfile from recent history
-            for msg in reversed(history):
-                if msg.role == AuthorRole.USER and "USER >" in msg.content:
-                    logfile = msg.content.replace("USER > ", "").strip()
-                    asyncio.create_task(slack_notifier.send_severity_classification(logfile, severity))
-                    break
+        if agent.name == SEVERITY_CLASSIFIER:
+            severity = content.strip().upper()
+            if severity in ("P1", "P2", "P3"):
+                logfile = _find_logfile(history)
+                if logfile:
+                    slack_notifier.send_severity_classification(logfile, severity)
+        
+        # Termination tokens come at the end of short, constrained replies
+        tail = content[-TERMINATION_TAIL_CHARS:]
+        if not TERMINATION_RE.search(tail):
+            return False
         
         # Check if incident resolved (no action needed)
-        if "no action needed" in last:
-            # Extract log file path from history to send resolved notification
-            for msg in reversed(history):
-                if msg.role == AuthorRole.USER and "USER >" in msg.content:
-                    logfile = msg.content.replace("USER > ", "").strip()
-                    await slack_notifier.send_incident_resolved(logfile)
-                    break
+        if "no action needed" in tail.lower():
+            logfile = _find_logfile(history)
+            if logfile:
+                slack_notifier.send_incident_resolved(logfile)
         
-        return (
-            "no action needed" in last
-            or "rca_saved" in last
-            or "stabilized" in last
-            or "recovered" in last
-            or "normalized" in last
-        )
+        return True
+
+def _find_logfile(history):
+    """Return the log file path from the most recent USER message, if any."""
+    for msg in reversed(history):
+        if msg.role == AuthorRole.USER and "USER >" in msg.content:
+            return msg.content.replace("USER > ", "").strip()
+    return None
 
 # =========================
 # Plugins
@@ -437,8 +541,8 @@ class NetworkOpsPlugin:
     """
 
     def _append(self, filepath: str, content: str) -> None:
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write("\n" + textwrap.dedent(content).strip())
+        append_text(filepath, "\n" + textwrap.dedent(content).strip())
+        invalidate_log_cache(filepath)
 
     @kernel_function(description="Restart a network node")
     def restart_node(self, node_id: str = "", logfile: str = "") -> str:
@@ -453,7 +557,7 @@ class NetworkOpsPlugin:
         
         result = f"Node {node_id} restarted and healthy."
         # Send Slack notification
-        asyncio.create_task(slack_notifier.send_action_taken(f"Restart node {node_id}", result))
+        slack_notifier.send_action_taken(f"Restart node {node_id}", result)
         return result
 
     @kernel_function(description="Reroute traffic from a congested cell to a neighbor")
@@ -468,7 +572,7 @@ class NetworkOpsPlugin:
         
         result = f"Traffic rerouted from {cell_id} to {neighbor_id}."
         # Send Slack notification
-        asyncio.create_task(slack_notifier.send_action_taken(f"Reroute traffic {cell_id} → {neighbor_id}", result))
+        slack_notifier.send_action_taken(f"Reroute traffic {cell_id} → {neighbor_id}", result)
         return result
 
     @kernel_function(description="Adjust QoS profile to stabilize voice/data")
@@ -483,7 +587,7 @@ class NetworkOpsPlugin:
         
         result = f"QoS adjusted to profile '{profile}'."
         # Send Slack notification
-        asyncio.create_task(slack_notifier.send_action_taken(f"Adjust QoS to {profile}", result))
+        slack_notifier.send_action_taken(f"Adjust QoS to {profile}", result)
         return result
 
     @kernel_function(description="Scale capacity on a specific cell")
@@ -498,7 +602,7 @@ class NetworkOpsPlugin:
         
         result = f"Capacity scaled on {cell_id} by {percent}%."
         # Send Slack notification
-        asyncio.create_task(slack_notifier.send_action_taken(f"Scale capacity on {cell_id} by {percent}%", result))
+        slack_notifier.send_action_taken(f"Scale capacity on {cell_id} by {percent}%", result)
         return result
 
     @kernel_function(description="Escalate unresolved incident to human NOC")
@@ -512,42 +616,64 @@ class NetworkOpsPlugin:
         
         result = "Incident escalated to NOC."
         # Send urgent Slack notification for escalation
-        asyncio.create_task(slack_notifier.send_notification(
+        slack_notifier.send_notification(
             message=f"🚨 **URGENT: Incident Escalated**\n"
-                   f"**Log File:** `{Path(logfile).name}`\n"
+                   f"**Log File:** `{os.path.basename(logfile)}`\n"
                    f"**Status:** Unable to auto-remediate - requires human intervention\n"
                    f"**Action:** NOC L2 ticket created\n"
                    f"**Time:** {ts()}",
             color="danger",
             title="Manual Intervention Required"
-        ))
+        )
         return result
 
+# Alert keywords that trigger an incident-detected notification
+RECENT_ALERT_RE = re.compile(r"error|alert|critical", re.IGNORECASE)
+
+# (filepath, mtime_ns) -> (content, has_alert), oldest entries evicted first
+_log_cache = {}
+LOG_CACHE_SIZE = 32
+
+def invalidate_log_cache(filepath: str) -> None:
+    """Drop cached reads of filepath after it has been modified."""
+    for key in [k for k in _log_cache if k[0] == filepath]:
+        _log_cache.pop(key, None)
+
 class LogFilePlugin:
     """Read a log file path and return its contents."""
 
     @kernel_function(description="Reads a log file and returns its contents")
     def read_log_file(self, filepath: str = "") -> str:
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
+        # Several agents read the same file per incident; reuse the cached copy
+        key = (filepath, os.stat(filepath).st_mtime_ns)
+        cached = _log_cache.get(key)
+        if cached is None:
+            with open(filepath, "r", encoding="utf-8") as f:
+                content = f.read()
+            recent_lines = content.rsplit('\n', 10)[-10:]
+            has_alert = any(RECENT_ALERT_RE.search(line) for line in recent_lines)
+            cached = _log_cache[key] = (content, has_alert)
+            if len(_log_cache) > LOG_CACHE_SIZE:
+                _log_cache.pop(next(iter(_log_cache)))
+        content, has_alert = cached
         
-        # Send incident detection notification if this is the first read (contains error/alert patterns)
-        if any(keyword in content.lower() for keyword in ["error", "alert", "critical", "down", "failed"]):
-            # Extract potential action from recent content for better notification
-            lines = content.split('\n')
-            recent_alerts = [line for line in lines[-10:] if any(k in line.lower() for k in ["error", "alert", "critical"])]
-            
-            if recent_alerts:
-                asyncio.create_task(slack_notifier.send_incident_detected(filepath, "Analyzing incident..."))
+        # Send incident detection notification if the last lines carry error/alert patterns
+        if has_alert:
+            slack_notifier.send_incident_detected(filepath, "Analyzing incident...")
         
         return content
 
 class RCASaverPlugin:
     """Persist RCA Markdown to ./rca_reports directory."""
 
+    def __init__(self):
+        # (logfile, out_path, markdown) waiting for the background writer
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._writer_task: asyncio.Task | None = None
+
     @kernel_function(description="Save RCA markdown to disk")
     def save_rca_report(self, logfile: str = "", rca_markdown: str = "") -> str:
-        log_name = Path(logfile).name.replace(".txt", "")
+        log_name = os.path.basename(logfile).replace(".txt", "")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         out_path = RCA_DIR / f"RCA_{log_name}_{timestamp}.md"
         
@@ -555,25 +681,54 @@ class RCASaverPlugin:
         if not rca_markdown.lstrip().startswith("#"):
             rca_markdown = f"# RCA Report - {log_name}\n\n" + rca_markdown
         
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(rca_markdown)
-        
-        # Debug: Check if method exists
-        if hasattr(slack_notifier, 'send_rca_completed'):
-            # Send RCA completion notification
-            asyncio.create_task(slack_notifier.send_rca_completed(logfile, str(out_path)))
-        else:
-            print("Warning: SlackNotifier does not have send_rca_completed method")
-            # List available methods for debugging
-            print(f"Available methods: {[method for method in dir(slack_notifier) if not method.startswith('_')]}")
+        # The path is known up front, so hand the write to the background writer
+        self._queue.put_nowait((logfile, out_path, rca_markdown))
+        if self._writer_task is None:
+            self._writer_task = _spawn(self._writer())
         
         return f"Saved: {out_path}"
 
-# =========================
-# Helpers
-# =========================
-def ts():
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    async def _writer(self):
+        """Drain queued RCAs and write each batch off the event loop"""
+        while True:
+            item = await self._queue.get()
+            batch = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            if batch:
+                written = await asyncio.to_thread(self._write_batch, batch)
+                for logfile, out_path in written:
+                    slack_notifier.send_rca_completed(logfile, str(out_path))
+            if stop:
+                return
+
+    @staticmethod
+    def _write_batch(batch):
+        """Write each RCA; a failed write is logged and skipped so the writer keeps draining"""
+        written = []
+        for logfile, out_path, rca_markdown in batch:
+            try:
+                write_text(str(out_path), rca_markdown)
+            except OSError as e:
+                print(f"Error saving RCA report {out_path}: {e}")
+                continue
+            written.append((logfile, out_path))
+        return written
+
+    async def close(self):
+        """Wait until every queued RCA has been written"""
+        if self._writer_task is not None:
+            self._queue.put_nowait(None)
+            await self._writer_task
+            self._writer_task = None
 
 # =========================
 # Entrypoint
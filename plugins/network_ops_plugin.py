@@ -1,14 +1,13 @@
 # plugins/network_ops_plugin.py
 import textwrap
-from utils.helpers import ts
+from utils.helpers import ts, append_text
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
 class NetworkOpsPlugin:
     """Executes corrective actions and appends results to log files."""
 
     def _append(self, filepath: str, content: str) -> None:
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write("\n" + textwrap.dedent(content).strip())
+        append_text(filepath, "\n" + textwrap.dedent(content).strip())
 
     @kernel_function(description="Restart a network node")
     def restart_node(self, node_id: str = "", logfile: str = "") -> str:
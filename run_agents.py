@@ -5,24 +5,32 @@ from dotenv import load_dotenv
 
 async def main():
     load_dotenv(override=True)
-    
+
     # Initialize orchestrator
     orchestrator = AgentOrchestrator()
-    
-    # Process logs directory
+
+    # Process logs directory concurrently, at most CONCURRENCY LLM calls at a time
     logs_dir = os.path.join(os.getcwd(), "logs")
-    for log_file in os.listdir(logs_dir):
-        if log_file.endswith(".txt"):
-            log_path = os.path.join(logs_dir, log_file)
-            print(f"Processing {log_file}...")
-            
-            # Process the incident
-            results = await orchestrator.process_network_incident(log_path)
-            
-            # Print results
-            print("Severity Classification:", results["severity_response"])
-            print("RCA Response:", results["rca_response"])
-            print("-" * 50)
+    with os.scandir(logs_dir) as it:
+        log_paths = sorted(entry.path for entry in it if entry.name.endswith(".txt"))
+
+    print(f"Processing {len(log_paths)} log files...")
+    all_results = await orchestrator.process_incidents(log_paths)
+
+    for log_path, results in zip(log_paths, all_results):
+        log_file = os.path.basename(log_path)
+        if "error" in results:
+            print(f"{log_file}: {results['error']}")
+            continue
+
+        # Print results
+        print(f"Results for {log_file}:")
+        print("Severity Classification:", results["severity_response"])
+        print("RCA Response:", results["rca_response"])
+        print("-" * 50)
+
+    # Flush any Slack notifications still in flight
+    await orchestrator.drain_notifications()
 
 if __name__ == "__main__":
     asyncio.run(main())
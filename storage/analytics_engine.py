@@ -5,46 +5,108 @@ Utility layer for aggregations used by the Analytics tab.
 
 import os
 import re
+import json
+import hashlib
 import pandas as pd
 from datetime import datetime
 
 RCA_DIR = os.path.join(os.getcwd(), "rca_reports")
+# Category/severity lines sit in the report header, so only the head is scanned
+HEADER_BYTES = 2048
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_CAT_RE = re.compile(rb"(?:Category|Cause|Issue):\s*(.*)", re.IGNORECASE)
+_SEV_RE = re.compile(rb"(?:Severity|Impact):\s*(.*)", re.IGNORECASE)
+COLUMNS = ("file", "timestamp", "category", "severity", "summary")
+# Parsed reports are cached here and only changed files are re-parsed
+CACHE_PATH = os.path.join(RCA_DIR, ".analytics_cache.parquet")
+CACHE_MANIFEST = os.path.join(RCA_DIR, ".analytics_cache.json")
+# Bump whenever _parse_report changes what it extracts, so cached rows are rebuilt
+PARSER_VERSION = 2
 
 class RCAAnalyticsEngine:
     def __init__(self):
         self.df = pd.DataFrame()
 
+    def _parse_report(self, file, path):
+        """Return the (file, timestamp, category, severity, summary) row for one report."""
+        with open(path, "rb") as f:
+            head = f.read(HEADER_BYTES)
+
+        # Extract timestamp from filename: rca_2025-08-22_14-20.txt
+        match = _DATE_RE.search(file)
+        timestamp = datetime.strptime(match.group(1), "%Y-%m-%d") if match else None
+
+        # Extract possible fault category and severity from the header
+        category_match = _CAT_RE.search(head)
+        severity_match = _SEV_RE.search(head)
+
+        category = category_match.group(1).decode("utf-8", errors="replace").strip() if category_match else "Unknown"
+        severity = severity_match.group(1).decode("utf-8", errors="replace").strip() if severity_match else "Medium"
+
+        # A multi-byte character may be cut at the read boundary; 300 chars fit well within it
+        summary = head.decode("utf-8", errors="ignore")[:300]  # preview snippet
+        return file, timestamp, category, severity, summary
+
+    def _load_cache(self):
+        """Return (manifest, DataFrame) from the last parse, or empty ones."""
+        try:
+            with open(CACHE_MANIFEST, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("parser_version") != PARSER_VERSION:
+                return {}, pd.DataFrame()
+            return manifest, pd.read_parquet(CACHE_PATH)
+        except Exception:
+            return {}, pd.DataFrame()
+
     def parse_reports(self):
-        reports = []
         if not os.path.exists(RCA_DIR):
             return pd.DataFrame()
 
-        for file in os.listdir(RCA_DIR):
-            if file.endswith(".txt"):
-                path = os.path.join(RCA_DIR, file)
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
+        entries = []
+        with os.scandir(RCA_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".txt"):
+                    st = entry.stat()
+                    entries.append((entry.name, entry.path, st.st_mtime_ns, st.st_size))
+        entries.sort()
+
+        # Directory fingerprint over (filename, mtime, size)
+        fingerprint = hashlib.blake2b(
+            b"".join(f"{name}:{mtime}:{size}\n".encode() for name, _, mtime, size in entries)
+        ).hexdigest()
 
-                    # Extract timestamp from filename: rca_2025-08-22_14-20.txt
-                    match = re.search(r"(\d{4}-\d{2}-\d{2})", file)
-                    timestamp = datetime.strptime(match.group(1), "%Y-%m-%d") if match else None
+        manifest, cached = self._load_cache()
+        if manifest.get("fingerprint") == fingerprint:
+            self.df = cached
+            return self.df
 
-                    # Extract possible fault category and severity from content
-                    category_match = re.search(r"(?:Category|Cause|Issue):\s*(.*)", content, re.IGNORECASE)
-                    severity_match = re.search(r"(?:Severity|Impact):\s*(.*)", content, re.IGNORECASE)
+        # Reuse rows for files whose (mtime, size) is unchanged, parse the rest
+        previous = manifest.get("files", {})
+        current = {name: [mtime, size] for name, _, mtime, size in entries}
+        unchanged = {name for name, stamp in current.items() if previous.get(name) == stamp}
 
-                    category = category_match.group(1).strip() if category_match else "Unknown"
-                    severity = severity_match.group(1).strip() if severity_match else "Medium"
+        columns = {name: [] for name in COLUMNS}
+        for name, path, _, _ in entries:
+            if name not in unchanged:
+                for column, value in zip(COLUMNS, self._parse_report(name, path)):
+                    columns[column].append(value)
+        frames = [pd.DataFrame(columns)]
+        if not cached.empty and unchanged:
+            frames.insert(0, cached[cached["file"].isin(unchanged)])
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        # Categorical columns shrink memory for the few distinct category/severity values
+        df["category"] = df["category"].astype("category")
+        df["severity"] = df["severity"].astype("category")
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        self.df = df
 
-                    reports.append({
-                        "file": file,
-                        "timestamp": timestamp,
-                        "category": category,
-                        "severity": severity,
-                        "summary": content[:300]  # preview snippet
-                    })
+        try:
+            self.df.to_parquet(CACHE_PATH, index=False)
+            with open(CACHE_MANIFEST, "w", encoding="utf-8") as f:
+                json.dump({"parser_version": PARSER_VERSION, "fingerprint": fingerprint, "files": current}, f)
+        except Exception as e:
+            print(f"⚠️ Could not write analytics cache: {e}")
 
-        self.df = pd.DataFrame(reports)
         return self.df
 
     def get_summary_stats(self):
@@ -52,9 +114,22 @@ class RCAAnalyticsEngine:
             return None
 
         total_incidents = len(self.df)
-        top_categories = self.df["category"].value_counts().head(5)
-        severity_counts = self.df["severity"].value_counts()
-        incidents_over_time = self.df.groupby("timestamp").size()
+        # Category and severity counts from one melt + groupby pass
+        counts = (
+            self.df[["category", "severity"]]
+            .melt()
+            .groupby(["variable", "value"], observed=True)
+            .size()
+        )
+        top_categories = counts["category"].sort_values(ascending=False).head(5).rename_axis("category")
+        severity_counts = counts["severity"].sort_values(ascending=False).rename_axis("severity")
+        # Daily series, including days without incidents, for charting
+        incidents_over_time = (
+            self.df.dropna(subset=["timestamp"])
+            .set_index("timestamp")
+            .resample("D")
+            .size()
+        )
 
         return {
             "total_incidents": total_incidents,
@@ -0,0 +1,75 @@
+"""
+embed_cache.py: Persistent SQLite cache of OpenAI embeddings keyed by SHA-256(model + text).
+Lets re-indexing and repeated queries skip embedding calls for text seen before.
+Vectors are stored int8-quantized with a per-vector scale (~4x smaller than float32).
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", os.path.join(os.getcwd(), ".embed_cache.sqlite3"))
+
+
+def quantize(vec) -> Tuple[float, bytes]:
+    """Return (scale, int8 bytes) such that vec ~= int8 values * scale."""
+    v = np.asarray(vec, dtype=np.float32)
+    scale = float(np.abs(v).max()) / 127 if v.size else 0.0
+    q = np.round(v / scale) if scale else np.zeros_like(v)
+    return scale, q.astype(np.int8).tobytes()
+
+
+def dequantize(scale: Optional[float], blob: bytes) -> np.ndarray:
+    """Inverse of quantize; a NULL scale marks a row stored as raw float32."""
+    if scale is None:
+        return np.frombuffer(blob, dtype=np.float32)
+    return np.frombuffer(blob, dtype=np.int8).astype(np.float32) * np.float32(scale)
+
+
+class EmbeddingCache:
+    def __init__(self, path: str = EMBED_CACHE_PATH):
+        # Shared across Streamlit session threads; a lock serializes access
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embed_cache (key BLOB PRIMARY KEY, vec BLOB NOT NULL, scale REAL)"
+            )
+            # Caches created before quantization have no scale column; their rows stay float32
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embed_cache)")}
+            if "scale" not in columns:
+                self._conn.execute("ALTER TABLE embed_cache ADD COLUMN scale REAL")
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.sha256((model + "\0" + text).encode("utf-8")).digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[float]]:
+        """Return cached vectors for whichever keys are present."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vec, scale FROM embed_cache WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, vec, scale in rows:
+                    found[key] = dequantize(scale, vec).tolist()
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, List[float]]]) -> None:
+        rows = []
+        for key, vec in items:
+            if vec:
+                scale, blob = quantize(vec)
+                rows.append((key, blob, scale))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO embed_cache (key, vec, scale) VALUES (?, ?, ?)", rows)
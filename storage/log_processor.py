@@ -1,64 +1,200 @@
 """
-log_processor.py: Scans logs/, generates RCA summaries using OpenAI, and writes them into rca_reports/. 
+log_processor.py: Scans logs/, generates RCA summaries using OpenAI, and writes them into rca_reports/.
 Simple batch processor independent of the agent pipeline.
 """
 
 import os
-from openai import OpenAI
+import io
+import json
+import time
+import asyncio
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
+from utils.helpers import write_text
+from utils.retry import openai_retry
 
 load_dotenv(override=True)
 
+# Upper bound on in-flight OpenAI requests
+MAX_CONCURRENT_REQUESTS = 20
+RCA_MODEL = "gpt-4"
+# Batch API polling interval for process_logs_batch
+BATCH_POLL_INTERVAL_SEC = 30
+
 class LogProcessor:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.api_key = os.getenv("OPENAI_API_KEY")
+
+    @openai_retry
+    async def _complete(self, client, prompt):
+        """Run one chat completion, backing off exponentially on transient API errors."""
+        response = await client.chat.completions.create(
+            model=RCA_MODEL,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response.choices[0].message.content
+
+    def _read_log(self, log_path):
+        with open(log_path, "r", encoding="utf-8") as f:
+            return f.read()
 
-    def process_logs(self, logs_dir, rca_dir):
+    def _build_prompt(self, log_content):
+        return f"""
+        You are a network RCA assistant. Analyze these logs and summarize:
+        1. Root cause
+        2. Severity level
+        3. Impacted components
+        4. Resolution steps
+
+        Logs:
+        {log_content[:4000]}
         """
-        Processes log files into RCA summaries and saves them in rca_reports.
+
+    async def _process_one(self, client, log_path, report_path, semaphore):
+        """
+        Generate and save the RCA summary for a single log file.
+        Returns True if a report was written.
         """
+        try:
+            # File I/O runs in worker threads so it overlaps in-flight OpenAI requests
+            log_content = await asyncio.to_thread(self._read_log, log_path)
+
+            # Generate RCA using OpenAI
+            prompt = self._build_prompt(log_content)
+            async with semaphore:
+                rca_summary = await self._complete(client, prompt)
+
+            await asyncio.to_thread(write_text, report_path, rca_summary)
+        except Exception as e:
+            print(f"❌ Error processing {os.path.basename(log_path)}: {e}")
+            return False
+
+        return True
+
+    async def _process_all(self, jobs, max_concurrent):
+        semaphore = asyncio.Semaphore(max_concurrent)
+        # The async client is scoped to this event loop; process_logs starts a new one per call
+        # openai_retry owns retries; the SDK's own retries would multiply the attempts
+        async with AsyncOpenAI(api_key=self.api_key, max_retries=0) as client:
+            results = await asyncio.gather(
+                *[self._process_one(client, log_path, report_path, semaphore) for log_path, report_path in jobs],
+                return_exceptions=True
+            )
+        return sum(1 for ok in results if ok is True)
+
+    def _pending_jobs(self, logs_dir, rca_dir):
+        """Return (log_path, report_path) pairs for logs without an RCA report yet."""
         if not os.path.exists(logs_dir):
-            return 0
+            return []
 
         os.makedirs(rca_dir, exist_ok=True)
-        reports_generated = 0
-
-        for file in os.listdir(logs_dir):
-            if file.endswith((".log", ".txt")):
-                log_path = os.path.join(logs_dir, file)
-                report_path = os.path.join(rca_dir, f"rca_{os.path.splitext(file)[0]}.txt")
-
-                # Skip already processed logs
-                if os.path.exists(report_path):
-                    continue
-
-                with open(log_path, "r", encoding="utf-8") as f:
-                    log_content = f.read()
-
-                # Generate RCA using OpenAI
-                prompt = f"""
-                You are a network RCA assistant. Analyze these logs and summarize:
-                1. Root cause
-                2. Severity level
-                3. Impacted components
-                4. Resolution steps
-
-                Logs:
-                {log_content[:4000]}
-                """
-                try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-4",
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                    rca_summary = response.choices[0].message.content
-                except Exception as e:
-                    print(f"❌ Error processing {file}: {e}")
-                    continue
-
-                with open(report_path, "w", encoding="utf-8") as rf:
-                    rf.write(rca_summary)
-
-                reports_generated += 1
-
-        return reports_generated
+
+        # One directory listing instead of an exists() call per log
+        with os.scandir(rca_dir) as it:
+            existing_reports = {entry.name for entry in it}
+
+        jobs = []
+        with os.scandir(logs_dir) as it:
+            for entry in it:
+                if entry.name.endswith((".log", ".txt")):
+                    report_name = f"rca_{os.path.splitext(entry.name)[0]}.txt"
+
+                    # Skip already processed logs, and x.log when x.txt already maps to the same report
+                    if report_name in existing_reports:
+                        continue
+
+                    existing_reports.add(report_name)
+                    jobs.append((entry.path, os.path.join(rca_dir, report_name)))
+
+        return jobs
+
+    def process_logs(self, logs_dir, rca_dir, max_concurrent=MAX_CONCURRENT_REQUESTS):
+        """
+        Processes log files into RCA summaries and saves them in rca_reports.
+        OpenAI requests for all files run concurrently; max_concurrent bounds
+        the number in flight.
+        """
+        jobs = self._pending_jobs(logs_dir, rca_dir)
+        if not jobs:
+            return 0
+
+        return asyncio.run(self._process_all(jobs, max_concurrent))
+
+    def process_logs_batch(self, logs_dir, rca_dir, poll_interval=BATCH_POLL_INTERVAL_SEC):
+        """
+        Same as process_logs, but submits every prompt as one OpenAI Batch API job
+        (half the price, 24h completion window) and blocks until it finishes.
+        Intended for overnight runs; returns the number of reports written.
+        """
+        jobs = self._pending_jobs(logs_dir, rca_dir)
+        if not jobs:
+            return 0
+
+        # custom_id is the report filename, so results map straight back to files
+        lines = []
+        for log_path, report_path in jobs:
+            log_content = self._read_log(log_path)
+            lines.append(json.dumps({
+                "custom_id": os.path.basename(report_path),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": RCA_MODEL,
+                    "messages": [{"role": "user", "content": self._build_prompt(log_content)}]
+                }
+            }))
+
+        client = OpenAI(api_key=self.api_key)
+        batch_input = client.files.create(
+            file=("rca_batch.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"⏳ Submitted batch {batch.id} with {len(jobs)} logs")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"❌ Batch {batch.id} ended with status {batch.status}")
+            return 0
+
+        written = 0
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                print(f"❌ Error processing {result.get('custom_id')}: {result.get('error') or response.get('status_code')}")
+                continue
+
+            rca_summary = response["body"]["choices"][0]["message"]["content"]
+            with open(os.path.join(rca_dir, result["custom_id"]), "w", encoding="utf-8") as rf:
+                rf.write(rca_summary)
+            written += 1
+
+        return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate RCA reports for logs/ into rca_reports/.")
+    parser.add_argument("--batch", action="store_true",
+                        help="submit all logs as one OpenAI Batch API job (cheaper, may take up to 24h)")
+    args = parser.parse_args()
+
+    logs_dir = os.path.join(os.getcwd(), "logs")
+    rca_dir = os.path.join(os.getcwd(), "rca_reports")
+    processor = LogProcessor()
+    if args.batch:
+        count = processor.process_logs_batch(logs_dir, rca_dir)
+    else:
+        count = processor.process_logs(logs_dir, rca_dir)
+    print(f"✅ Generated {count} RCA reports.")
@@ -0,0 +1,82 @@
+"""
+qa_cache.py: Semantic cache of answer_query() results in SQLite.
+A new question reuses a cached answer when its embedding is close enough
+(cosine similarity) to a previously answered one and that answer has not expired.
+Question embeddings are stored int8-quantized; cosine similarity is scale-invariant,
+so lookups compare the int8 values directly.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+from storage.embed_cache import quantize
+
+QA_CACHE_PATH = os.getenv("QA_CACHE_PATH", os.path.join(os.getcwd(), ".qa_cache.sqlite3"))
+QA_CACHE_THRESHOLD = 0.95
+QA_CACHE_TTL_SEC = 24 * 60 * 60
+
+
+class AnswerCache:
+    def __init__(self, path: str = QA_CACHE_PATH, threshold: float = QA_CACHE_THRESHOLD,
+                 ttl: int = QA_CACHE_TTL_SEC):
+        self.threshold = threshold
+        self.ttl = ttl
+        # Shared across Streamlit session threads; a lock serializes access
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            # Entries live at most a day, so a pre-quantization table is simply rebuilt
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(qa_cache)")}
+            if columns and "scale" not in columns:
+                self._conn.execute("DROP TABLE qa_cache")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS qa_cache "
+                "(embedding BLOB NOT NULL, scale REAL NOT NULL, answer TEXT NOT NULL, "
+                "sources TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+
+    def lookup(self, embedding: List[float]) -> Optional[Dict]:
+        """Return the cached answer most similar to embedding, if it clears the threshold."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, answer, sources FROM qa_cache WHERE ts >= ?",
+                (int(time.time()) - self.ttl,)
+            ).fetchall()
+        if not rows:
+            return None
+
+        _, q_blob = quantize(embedding)
+        q = np.frombuffer(q_blob, dtype=np.int8).astype(np.float32)
+        cached = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.int8).reshape(len(rows), -1)
+        if cached.shape[1] != q.shape[0]:
+            return None
+        cached = cached.astype(np.float32)
+
+        # Cosine similarity against every cached question in one matmul
+        norms = np.linalg.norm(cached, axis=1) * np.linalg.norm(q)
+        scores = (cached @ q) / np.where(norms == 0, 1.0, norms)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        _, answer, sources = rows[best]
+        return {"answer": answer, "sources": json.loads(sources)}
+
+    def store(self, embedding: List[float], answer: str, sources: List[str]) -> None:
+        now = int(time.time())
+        scale, blob = quantize(embedding)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM qa_cache WHERE ts < ?", (now - self.ttl,))
+            self._conn.execute(
+                "INSERT INTO qa_cache (embedding, scale, answer, sources, ts) VALUES (?, ?, ?, ?, ?)",
+                (blob, scale, answer, json.dumps(sources), now)
+            )
+
+    def clear(self) -> None:
+        """Drop every cached answer, e.g. after new reports are indexed."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM qa_cache")
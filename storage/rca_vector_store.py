@@ -4,13 +4,65 @@ and performs semantic search/RAG via answer_query().
 Uses OpenAI embeddings and returns consolidated answers with sources.
 """
 import os
-from typing import List, Dict
+import base64
+import asyncio
+import hashlib
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import tiktoken
+import zstandard as zstd
 from dotenv import load_dotenv
-from openai import OpenAI
-from pinecone import Pinecone
+from openai import OpenAI, AsyncOpenAI
+try:
+    # gRPC client gives higher upsert throughput; same Index API
+    from pinecone.grpc import PineconeGRPC as Pinecone
+except ImportError:
+    from pinecone import Pinecone
+from storage.embed_cache import EmbeddingCache
+from storage.qa_cache import AnswerCache
+from utils.retry import openai_retry, pinecone_retry
 
 load_dotenv(override=True)
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+CHAT_MODEL = "gpt-4o-mini"
+# Upper bound on retrieved-context tokens sent to CHAT_MODEL by answer_query
+CONTEXT_TOKEN_BUDGET = 6000
+# Per-request limits for batched embedding calls (API max is 2048 inputs / 300k tokens)
+EMBED_BATCH_SIZE = 256
+EMBED_BATCH_MAX_TOKENS = 250_000
+# Upper bound on in-flight embedding requests
+MAX_CONCURRENT_REQUESTS = 20
+# Pinecone caps upsert requests at 100 vectors / 2MB; batches are sent in parallel
+UPSERT_BATCH_SIZE = 100
+UPSERT_MAX_CONCURRENCY = 30
+# Chunks embedded and upserted per streaming step when indexing
+STREAM_CHUNK_SIZE = 1000
+# Chunk text is stored zstd-compressed (base64) in metadata["content_z"] to cut upload size
+CONTENT_ZSTD_LEVEL = 3
+
+
+def _compress_content(text: str) -> str:
+    # Compressor objects are not thread-safe, so each call builds its own
+    return base64.b64encode(zstd.ZstdCompressor(level=CONTENT_ZSTD_LEVEL).compress(text.encode("utf-8"))).decode("ascii")
+
+
+def _decode_content(md: Dict) -> Dict:
+    """Replace compressed content_z in match metadata with plain-text content, in place."""
+    if md and "content_z" in md:
+        md["content"] = zstd.ZstdDecompressor().decompress(base64.b64decode(md.pop("content_z"))).decode("utf-8")
+    return md
+
+
+def _chunks(iterable, n=UPSERT_BATCH_SIZE):
+    """Yield successive lists of at most n items from iterable."""
+    it = iter(iterable)
+    batch = list(islice(it, n))
+    while batch:
+        yield batch
+        batch = list(islice(it, n))
+
 class RCAVectorStore:
     def __init__(self):
         # Load API keys and index name
@@ -19,9 +71,23 @@ class RCAVectorStore:
         self.namespace = os.getenv("PINECONE_NAMESPACE", "rca-logs")
 
         # Initialize OpenAI and Pinecone clients
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        # openai_retry owns retries; the SDK's own retries would multiply the attempts
+        self.client = OpenAI(api_key=self.openai_api_key, max_retries=0)
         self.pc = Pinecone(api_key=self.api_key)
 
+        try:
+            self.chat_encoding = tiktoken.encoding_for_model(CHAT_MODEL)
+        except KeyError:
+            # Older tiktoken releases do not know the model name
+            self.chat_encoding = tiktoken.get_encoding("o200k_base")
+
+        # Persistent embedding cache, plus in-process reuse of repeated query embeddings
+        self.embed_cache = EmbeddingCache()
+        self._cached_embedding = lru_cache(maxsize=4096)(self._fetch_embedding)
+        # Answers to near-duplicate questions are served from here
+        self.qa_cache = AnswerCache()
+
         # Reuse existing index if present
         self._connect_to_index()
 
@@ -39,18 +105,89 @@ class RCAVectorStore:
 
         self.index = self.pc.Index(self.index_name)
 
+    def _fetch_embedding(self, text: str) -> tuple:
+        """Look up the embedding in the persistent cache, calling OpenAI on a miss."""
+        key = EmbeddingCache.key(EMBEDDING_MODEL, text)
+        cached = self.embed_cache.get_many([key]).get(key)
+        if cached:
+            return tuple(cached)
+
+        embedding = self._create_embedding(text)
+        self.embed_cache.put_many([(key, embedding)])
+        return tuple(embedding)
+
+    @openai_retry
+    def _create_embedding(self, text: str) -> List[float]:
+        response = self.client.embeddings.create(
+            input=text,
+            model=EMBEDDING_MODEL
+        )
+        return response.data[0].embedding
+
     def _embed_text(self, text: str) -> List[float]:
         """Generate embedding for a given text using OpenAI."""
         try:
-            response = self.client.embeddings.create(
-                input=text,
-                model="text-embedding-3-small"
-            )
-            return response.data[0].embedding
+            # Failures raise inside the lru_cache wrapper, so they are never cached
+            return list(self._cached_embedding(text))
         except Exception as e:
             print(f"❌ Error generating embedding: {e}")
             return []
 
+    @openai_retry
+    async def _embed_batch(self, client: AsyncOpenAI, batch: List[str]) -> List[List[float]]:
+        """Embed one batch, backing off exponentially on transient API errors."""
+        response = await client.embeddings.create(input=batch, model=EMBEDDING_MODEL)
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+    async def _embed_texts(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> List[List[float]]:
+        """
+        Generate embeddings for many texts with as few API calls as possible.
+        Batches hold at most batch_size inputs and EMBED_BATCH_MAX_TOKENS tokens
+        and are sent concurrently, at most MAX_CONCURRENT_REQUESTS at a time.
+        Texts already in the embedding cache are not sent to the API.
+        Output order matches input; texts from a failed batch get an empty list.
+        """
+        keys = [EmbeddingCache.key(EMBEDDING_MODEL, text) for text in texts]
+        cached = self.embed_cache.get_many(keys)
+        # The API rejects empty input, which would fail the whole batch it lands in
+        misses = list(dict.fromkeys(text for text, key in zip(texts, keys) if text and key not in cached))
+
+        encoding = tiktoken.encoding_for_model(EMBEDDING_MODEL)
+        batches = []
+        current, current_tokens = [], 0
+        for text in misses:
+            n_tokens = len(encoding.encode(text))
+            if current and (len(current) >= batch_size or current_tokens + n_tokens > EMBED_BATCH_MAX_TOKENS):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += n_tokens
+        if current:
+            batches.append(current)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def embed(batch):
+            try:
+                async with semaphore:
+                    return await self._embed_batch(client, batch)
+            except Exception as e:
+                print(f"❌ Error generating embeddings: {e}")
+                return [[] for _ in batch]
+
+        # The async client is scoped to this event loop; callers start a new one per run
+        async with AsyncOpenAI(api_key=self.openai_api_key, max_retries=0) as client:
+            results = await asyncio.gather(*[embed(batch) for batch in batches])
+
+        fresh = {}
+        for batch, batch_embeddings in zip(batches, results):
+            for text, embedding in zip(batch, batch_embeddings):
+                if embedding:
+                    fresh[EmbeddingCache.key(EMBEDDING_MODEL, text)] = embedding
+        self.embed_cache.put_many(fresh.items())
+        cached.update(fresh)
+        return [cached.get(key, []) for key in keys]
+
     def _chunk_text(self, text: str, chunk_size: int = 800) -> List[str]:
         """
         Split text into chunks to improve semantic search.
@@ -59,62 +196,212 @@ class RCAVectorStore:
         words = text.split()
         chunks = []
         current_chunk = []
+        # Length of " ".join(current_chunk), tracked incrementally
+        current_len = 0
 
         for word in words:
-            if len(" ".join(current_chunk + [word])) <= chunk_size:
+            add = len(word) + (1 if current_chunk else 0)
+            if current_len + add <= chunk_size:
                 current_chunk.append(word)
+                current_len += add
             else:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = [word]
+                # A single word longer than chunk_size arrives with nothing to flush
+                if current_chunk:
+                    chunks.append(" ".join(current_chunk))
+                current_chunk, current_len = [word], len(word)
 
         if current_chunk:
             chunks.append(" ".join(current_chunk))
 
         return chunks
 
-    def chunk_and_store_reports(self, rca_dir: str) -> str:
+    def chunk_and_store_reports(self, rca_dir: str, files: Optional[List[str]] = None) -> Dict:
         """
         Process RCA reports, chunk them, generate embeddings, and store them in Pinecone.
+        If files is given, only those report names inside rca_dir are indexed.
+        Returns {"message": status text, "indexed": reports now fully indexed
+        (including unchanged ones), "failed": reports to retry on the next run}.
         """
         if not os.path.exists(rca_dir):
-            return "⚠️ RCA reports folder not found!"
+            return {"message": "⚠️ RCA reports folder not found!", "indexed": [], "failed": []}
 
-        files = [f for f in os.listdir(rca_dir) if f.endswith(".txt")]
+        if files is None:
+            with os.scandir(rca_dir) as it:
+                files = [entry.name for entry in it if entry.name.endswith(".txt") and entry.is_file()]
         if not files:
-            return "⚠️ No RCA reports found to index."
+            return {"message": "⚠️ No RCA reports found to index.", "indexed": [], "failed": []}
 
-        vectors = []
-        counter = 0
+        stored = self._fetch_doc_state(files)
+        stats = {"skipped": 0, "changed": {}, "failed": set()}
+        counter, failed_sources = self._upsert_stream(self._iter_vectors(rca_dir, files, stored, stats))
+        failed = stats["failed"] | failed_sources
 
-        for file in files:
-            file_path = os.path.join(rca_dir, file)
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+        # A report's new hash is recorded only once all of its chunks landed,
+        # so a partly indexed report is picked up again on the next run
+        for file, doc_state in stats["changed"].items():
+            if file in failed:
+                continue
+            try:
+                self._set_doc_state(file, *doc_state)
+            except Exception as e:
+                print(f"❌ Could not record index state for {file}: {e}")
+                failed.add(file)
 
-            chunks = self._chunk_text(content)
+        if counter:
+            # Cached answers may predate the newly indexed reports
+            self.qa_cache.clear()
+        if failed:
+            message = (f"⚠️ Indexed {counter} chunks, but {len(failed)} RCA reports failed and will be "
+                       f"retried on the next run: {', '.join(sorted(failed))}")
+        elif counter:
+            message = f"✅ Successfully indexed {counter} chunks from {len(files) - stats['skipped']} RCA reports."
+        elif stats["skipped"] == len(files):
+            message = f"✅ All {len(files)} RCA reports are already indexed and unchanged."
+        else:
+            message = "⚠️ No chunks were indexed."
+        return {
+            "message": message,
+            "indexed": [file for file in files if file not in failed],
+            "failed": sorted(failed)
+        }
 
-            for idx, chunk in enumerate(chunks):
-                embedding = self._embed_text(chunk)
+    def _fetch_doc_state(self, files: List[str]) -> Dict[str, tuple]:
+        """
+        Return {file: (doc_hash, chunk_count)} for reports already in the index,
+        read from the metadata of each report's first chunk.
+        """
+        stored = {}
+        for batch in _chunks(files):
+            try:
+                response = self.index.fetch(ids=[f"{file}_0" for file in batch], namespace=self.namespace)
+            except Exception as e:
+                print(f"⚠️ Could not fetch indexed report hashes: {e}")
+                return {}
+            for vector in response.vectors.values():
+                md = vector["metadata"] if isinstance(vector, dict) else vector.metadata
+                if md and md.get("doc_hash"):
+                    stored[md.get("source")] = (md["doc_hash"], int(md.get("chunk_count", 0)))
+        return stored
+
+    def _iter_vectors(self, rca_dir: str, files: List[str], stored: Dict[str, tuple],
+                      stats: Dict[str, int]) -> Iterator[Dict]:
+        """
+        Yield Pinecone vector dicts for the given reports.
+        Chunks are embedded in groups of STREAM_CHUNK_SIZE, so only one group of
+        chunk strings and embeddings is held in memory at a time.
+        Reports whose content hash matches the indexed doc_hash are skipped; when a
+        changed report shrinks, its leftover trailing chunks are deleted.
+        Changed reports are recorded in stats["changed"] as {file: (doc_hash, chunk_count)},
+        and reports with a chunk that failed to embed are added to stats["failed"].
+        The first chunk keeps the previously indexed doc_hash until the caller
+        records the new one with _set_doc_state.
+        """
+        pending = []
+
+        def embed_pending():
+            embeddings = asyncio.run(self._embed_texts([chunk for _, _, chunk, _ in pending]))
+            for (file, idx, chunk, doc_meta), embedding in zip(pending, embeddings):
                 if not embedding:
+                    stats["failed"].add(file)
                     continue
-
-                vector_id = f"{file}_{idx}"
-                vectors.append({
-                    "id": vector_id,
+                yield {
+                    "id": f"{file}_{idx}",
                     "values": embedding,
                     "metadata": {
                         "source": file,
                         "chunk": idx,
-                        "content": chunk
+                        "content_z": _compress_content(chunk),
+                        **doc_meta
                     }
-                })
-                counter += 1
+                }
+            pending.clear()
 
-        if vectors:
-            self.index.upsert(vectors=vectors, namespace=self.namespace)
-            return f"✅ Successfully indexed {counter} chunks from {len(files)} RCA reports."
-        else:
-            return "⚠️ No chunks were indexed."
+        for file in files:
+            file_path = os.path.join(rca_dir, file)
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+
+            doc_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+            previous_hash, previous_count = stored.get(file, (None, 0))
+            if doc_hash == previous_hash:
+                stats["skipped"] += 1
+                continue
+
+            chunks = self._chunk_text(content)
+            stale_ids = [f"{file}_{idx}" for idx in range(len(chunks), previous_count)]
+            if stale_ids:
+                for batch in _chunks(stale_ids, STREAM_CHUNK_SIZE):
+                    self.index.delete(ids=batch, namespace=self.namespace)
+
+            if chunks:
+                stats["changed"][file] = (doc_hash, len(chunks))
+            previous_meta = {"doc_hash": previous_hash, "chunk_count": previous_count} if previous_hash else {}
+            for idx, chunk in enumerate(chunks):
+                pending.append((file, idx, chunk, previous_meta if idx == 0 else {}))
+                if len(pending) >= STREAM_CHUNK_SIZE:
+                    yield from embed_pending()
+
+        if pending:
+            yield from embed_pending()
+
+    def _upsert_stream(self, vectors: Iterable[Dict]) -> Tuple[int, Set[str]]:
+        """
+        Upsert vectors as they are produced, STREAM_CHUNK_SIZE at a time, each
+        group sent as parallel UPSERT_BATCH_SIZE requests.
+        Returns (count upserted, sources of vectors that could not be upserted).
+        """
+        counter = 0
+        failed_sources = set()
+        for group in _chunks(vectors, STREAM_CHUNK_SIZE):
+            response = self.index.upsert(
+                vectors=group,
+                namespace=self.namespace,
+                batch_size=UPSERT_BATCH_SIZE,
+                max_concurrency=UPSERT_MAX_CONCURRENCY,
+                show_progress=False
+            )
+            counter += len(group)
+            # A failed batch is reported, not raised; resend its items with backoff
+            for batch in _chunks(response.failed_items):
+                try:
+                    self._upsert(batch)
+                except Exception as e:
+                    print(f"❌ Error upserting vectors: {e}")
+                    counter -= len(batch)
+                    # Vector ids are "<source>_<chunk>"
+                    failed_sources.update(vector["id"].rsplit("_", 1)[0] for vector in batch)
+        return counter, failed_sources
+
+    @pinecone_retry
+    def _upsert(self, batch: List[Dict]) -> None:
+        self.index.upsert(vectors=batch, namespace=self.namespace)
+
+    @pinecone_retry
+    def _set_doc_state(self, file: str, doc_hash: str, chunk_count: int) -> None:
+        """Record a fully indexed report's content hash on its first chunk."""
+        self.index.update(
+            id=f"{file}_0",
+            set_metadata={"doc_hash": doc_hash, "chunk_count": chunk_count},
+            namespace=self.namespace
+        )
+
+    @pinecone_retry
+    def _query(self, embedding: List[float], top_k: int):
+        return self.index.query(
+            vector=embedding,
+            top_k=top_k,
+            include_metadata=True,
+            namespace=self.namespace
+        )
+
+    @openai_retry
+    def _chat(self, prompt: str) -> str:
+        resp = self.client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+        )
+        return resp.choices[0].message.content
 
     def search_similar(self, query: str, top_k: int = 5) -> List[Dict]:
         """
@@ -125,33 +412,58 @@ class RCAVectorStore:
             return []
 
         try:
-            results = self.index.query(
-                vector=embedding,
-                top_k=top_k,
-                include_metadata=True,
-                namespace=self.namespace
-            )
+            results = self._query(embedding, top_k)
 
+            # Vectors indexed before compression still carry plain "content"
+            for m in results.matches:
+                _decode_content(m["metadata"] if isinstance(m, dict) else m.metadata)
             return results.matches
         except Exception as e:
             print(f"❌ Search error: {e}")
             return []
 
-    def answer_query(self, query: str, top_k: int = 5) -> Dict:
-        matches = self.search_similar(query, top_k=top_k)
-        if not matches:
-            return {"answer": "No relevant results found.", "sources": []}
+    def _build_context(self, matches, budget: int = CONTEXT_TOKEN_BUDGET):
+        """
+        Join match contents, best score first, until the token budget is spent;
+        lower-scoring matches that do not fit are dropped. Chunks from the same
+        source share one "Source:" entry. Returns (context, sources used).
+        """
+        def score(m):
+            return (m["score"] if isinstance(m, dict) else m.score) or 0.0
 
-        context_snippets = []
-        sources = []
-        for m in matches:
+        by_source = {}
+        used = 0
+        for m in sorted(matches, key=score, reverse=True):
             md = m["metadata"] if isinstance(m, dict) else m.metadata
             src = md.get("source", "Unknown")
             txt = md.get("content", "")
-            context_snippets.append(f"Source: {src}\nContent: {txt}")
-            sources.append(src)
+            tokens = self.chat_encoding.encode(txt)
+            if used + len(tokens) > budget:
+                if by_source:
+                    break
+                # Even the best match alone is over budget: keep its head
+                txt = self.chat_encoding.decode(tokens[:budget])
+                tokens = tokens[:budget]
+            by_source.setdefault(src, []).append(txt)
+            used += len(tokens)
 
-        context = "\n\n".join(context_snippets)
+        context = "\n\n".join(
+            f"Source: {src}\nContent: " + "\n...\n".join(texts) for src, texts in by_source.items()
+        )
+        return context, list(by_source)
+
+    def answer_query(self, query: str, top_k: int = 5) -> Dict:
+        query_embedding = self._embed_text(query)
+        if query_embedding:
+            cached = self.qa_cache.lookup(query_embedding)
+            if cached:
+                return cached
+
+        matches = self.search_similar(query, top_k=top_k)
+        if not matches:
+            return {"answer": "No relevant results found.", "sources": []}
+
+        context, sources = self._build_context(matches)
         prompt = (
             "You are an expert network RCA assistant. Based ONLY on the provided context, "
             "write a concise consolidated answer as bullet points.\n"
@@ -164,14 +476,11 @@ class RCAVectorStore:
         )
 
         try:
-            resp = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-            )
-            answer = resp.choices[0].message.content
+            answer = self._chat(prompt)
         except Exception as e:
-            answer = f"Error generating answer: {e}"
+            return {"answer": f"Error generating answer: {e}", "sources": sorted(list(dict.fromkeys(sources)))}
 
         unique_sources = sorted(list(dict.fromkeys(sources)))
+        if query_embedding:
+            self.qa_cache.store(query_embedding, answer, unique_sources)
         return {"answer": answer, "sources": unique_sources}
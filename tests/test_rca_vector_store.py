@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pinecone.grpc import GrpcIndex, UpsertResponse
+from pinecone.models.batch import BatchError
+
+from storage.rca_vector_store import RCAVectorStore, UPSERT_BATCH_SIZE
+
+
+def _vector(i):
+    return {"id": f"report.txt_{i}", "values": [0.1, 0.2], "metadata": {"source": "report.txt", "chunk": i}}
+
+
+def _store():
+    """RCAVectorStore wired to an index mock that enforces the real GrpcIndex signatures."""
+    store = RCAVectorStore.__new__(RCAVectorStore)
+    store.namespace = "rca-logs"
+    store.index = mock.create_autospec(GrpcIndex, instance=True)
+    return store
+
+
+class UpsertStreamTest(unittest.TestCase):
+    def test_upserts_every_vector_in_batches(self):
+        store = _store()
+        store.index.upsert.side_effect = lambda **kw: UpsertResponse(upserted_count=len(kw["vectors"]))
+
+        count, failed_sources = store._upsert_stream(_vector(i) for i in range(250))
+
+        self.assertEqual((count, failed_sources), (250, set()))
+        kwargs = store.index.upsert.call_args.kwargs
+        self.assertEqual(kwargs["batch_size"], UPSERT_BATCH_SIZE)
+        self.assertEqual(kwargs["namespace"], "rca-logs")
+        self.assertEqual(len(kwargs["vectors"]), 250)
+
+    def test_resends_failed_batches(self):
+        store = _store()
+        failed = [_vector(i) for i in range(3)]
+        error = BatchError(batch_index=0, items=failed, error=Exception("unavailable"), error_message="unavailable")
+        store.index.upsert.side_effect = [
+            UpsertResponse(upserted_count=2, errors=[error]),
+            UpsertResponse(upserted_count=3),
+        ]
+
+        count, failed_sources = store._upsert_stream(_vector(i) for i in range(5))
+
+        self.assertEqual((count, failed_sources), (5, set()))
+        self.assertEqual(store.index.upsert.call_count, 2)
+        self.assertEqual(store.index.upsert.call_args.kwargs["vectors"], failed)
+
+    def test_reports_sources_that_still_fail(self):
+        store = _store()
+        failed = [_vector(i) for i in range(3)]
+        error = BatchError(batch_index=0, items=failed, error=Exception("bad request"), error_message="bad request")
+        store.index.upsert.side_effect = [UpsertResponse(upserted_count=2, errors=[error]), ValueError("bad request")]
+
+        count, failed_sources = store._upsert_stream(_vector(i) for i in range(5))
+
+        self.assertEqual((count, failed_sources), (2, {"report.txt"}))
+
+
+class ChunkAndStoreReportsTest(unittest.TestCase):
+    def setUp(self):
+        self.rca_dir = tempfile.mkdtemp()
+        for name in ("ok.txt", "broken.txt"):
+            with open(os.path.join(self.rca_dir, name), "w", encoding="utf-8") as f:
+                f.write(f"{name} link down on core switch")
+
+    def test_hash_is_recorded_only_for_fully_indexed_reports(self):
+        store = _store()
+        store.qa_cache = mock.Mock()
+        store.index.fetch.return_value = mock.Mock(vectors={})
+        store.index.upsert.side_effect = lambda **kw: UpsertResponse(upserted_count=len(kw["vectors"]))
+
+        async def embed_texts(texts):
+            # Every chunk of broken.txt fails to embed
+            return [[] if text.startswith("broken.txt") else [0.1, 0.2] for text in texts]
+
+        with mock.patch.object(store, "_embed_texts", side_effect=embed_texts):
+            result = store.chunk_and_store_reports(self.rca_dir, files=["ok.txt", "broken.txt"])
+
+        self.assertEqual(result["indexed"], ["ok.txt"])
+        self.assertEqual(result["failed"], ["broken.txt"])
+        self.assertIn("broken.txt", result["message"])
+        store.index.update.assert_called_once()
+        self.assertEqual(store.index.update.call_args.kwargs["id"], "ok.txt_0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+from pinecone.errors import (
+    ApiError,
+    NotFoundError,
+    PineconeConnectionError,
+    PineconeTimeoutError,
+    RateLimitError,
+    ServiceError,
+)
+
+from utils.retry import _is_transient_pinecone_error, pinecone_retry
+
+
+class TransientPineconeErrorTest(unittest.TestCase):
+    def test_transient_sdk_errors(self):
+        for exc in (
+            RateLimitError(),
+            ServiceError(),
+            ApiError("Service Unavailable", 503),
+            PineconeConnectionError("connection reset by peer"),
+            PineconeTimeoutError("deadline exceeded"),
+            ApiError("unavailable", 0, error_code="UNAVAILABLE"),
+            ApiError("quota exhausted", 0, error_code="RESOURCE_EXHAUSTED"),
+            ApiError("deadline exceeded", 0, error_code="DEADLINE_EXCEEDED"),
+        ):
+            with self.subTest(exc=repr(exc)):
+                self.assertTrue(_is_transient_pinecone_error(exc))
+
+    def test_grpc_status_code(self):
+        code = mock.Mock()
+        code.name = "UNAVAILABLE"
+        exc = Exception("unavailable")
+        exc.code = lambda: code
+        self.assertTrue(_is_transient_pinecone_error(exc))
+
+    def test_permanent_errors(self):
+        for exc in (
+            ApiError("Bad Request", 400),
+            NotFoundError(),
+            ApiError("invalid argument", 0, error_code="INVALID_ARGUMENT"),
+            ValueError("malformed vector"),
+        ):
+            with self.subTest(exc=repr(exc)):
+                self.assertFalse(_is_transient_pinecone_error(exc))
+
+    def test_permanent_error_is_not_retried(self):
+        calls = []
+
+        @pinecone_retry
+        def upsert():
+            calls.append(1)
+            raise ApiError("Bad Request", 400)
+
+        with self.assertRaises(ApiError):
+            upsert()
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import time
+
+# O_CLOEXEC is POSIX-only; Windows has no equivalent flag
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+_TRUNC_FLAGS = os.O_WRONLY | os.O_TRUNC | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+
+
+# [epoch second, formatted string] of the last ts() call
+_ts_cache = [None, ""]
+
+
+def ts() -> str:
+    """
+    Current local time formatted for log entries.
+    The string is rebuilt only when the wall-clock second changes.
+    """
+    sec = int(time.time())
+    if _ts_cache[0] != sec:
+        _ts_cache[0] = sec
+        _ts_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    return _ts_cache[1]
+
+
+def append_text(path: str, text: str) -> None:
+    """
+    Append text to a file with a single os.write on an O_APPEND descriptor.
+    Skips Python's buffered text layer; O_APPEND keeps concurrent appends whole.
+    """
+    fd = os.open(path, _APPEND_FLAGS, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def write_text(path: str, text: str) -> None:
+    """Replace the contents of a file with text using a single os.write."""
+    fd = os.open(path, _TRUNC_FLAGS, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8"))
+    finally:
+        os.close(fd)
@@ -0,0 +1,46 @@
+from openai import APIConnectionError, InternalServerError, RateLimitError
+from pinecone.errors import PineconeConnectionError, PineconeTimeoutError
+from tenacity import retry, retry_if_exception, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+# Shared backoff: 2s, 4s, 8s ... capped at 60s, giving up after 6 attempts
+_WAIT = wait_exponential(multiplier=1, min=2, max=60)
+_STOP = stop_after_attempt(6)
+_TRANSIENT_GRPC_CODES = frozenset({"UNAVAILABLE", "RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED"})
+
+
+def _is_transient_pinecone_error(exc: BaseException) -> bool:
+    """
+    Throttling (429), server errors (5xx), timeouts and dropped connections.
+    Pinecone's exception classes differ between the REST and gRPC clients,
+    so errors are classified by HTTP status or gRPC status code rather than by type.
+    """
+    if isinstance(exc, (ConnectionError, TimeoutError, PineconeConnectionError, PineconeTimeoutError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(exc, "status", None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    # grpc.RpcError exposes code() -> StatusCode; Pinecone errors carry the code name in error_code
+    code = getattr(exc, "code", None)
+    if callable(code):
+        code = code()
+    if code is None:
+        code = getattr(exc, "error_code", None)
+    return str(getattr(code, "name", code)).upper() in _TRANSIENT_GRPC_CODES
+
+
+# Rate limits, 5xx and network failures are retried; other 4xx errors fail immediately
+openai_retry = retry(
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+    wait=_WAIT,
+    stop=_STOP,
+    reraise=True,
+)
+
+pinecone_retry = retry(
+    retry=retry_if_exception(_is_transient_pinecone_error),
+    wait=_WAIT,
+    stop=_STOP,
+    reraise=True,
+)
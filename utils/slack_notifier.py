@@ -1,26 +1,34 @@
 import os
-import requests
+import asyncio
+import aiohttp
 from dotenv import load_dotenv
 from typing import Dict, Any
 
+REQUEST_TIMEOUT_SEC = 5
+# Retry throttling (429) and transient 5xx responses with exponential backoff
+MAX_RETRIES = 3
+RETRY_BACKOFF_SEC = 0.5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
 class SlackNotifier:
     def __init__(self):
         load_dotenv(override=True)
         self.webhook_url = os.getenv("SLACK_WEBHOOK_URL")
-        
-    def send_notification(self, message: str, incident_data: Dict[str, Any] = None) -> bool:
-        """
-        Send a notification to Slack channel
-        Args:
-            message: Main message text
-            incident_data: Optional dictionary containing incident details
-        Returns:
-            bool: True if notification was sent successfully
-        """
-        if not self.webhook_url:
-            print("⚠️ Slack webhook URL not configured")
-            return False
+        self._session: aiohttp.ClientSession | None = None
+        # Notifications waiting to be posted by the consumer task
+        self._queue: asyncio.Queue | None = None
+        self._consumer_task: asyncio.Task | None = None
 
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Lazily create one keep-alive session reused for every webhook call"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SEC)
+            )
+        return self._session
+
+    def _build_payload(self, message: str, incident_data: Dict[str, Any] = None) -> Dict[str, Any]:
         # Basic message block
         blocks = [
             {
@@ -46,18 +54,65 @@ class SlackNotifier:
                 "fields": fields
             })
 
-        payload = {
+        return {
             "blocks": blocks
         }
 
+    async def send_notification(self, message: str, incident_data: Dict[str, Any] = None) -> bool:
+        """
+        Send a notification to Slack channel
+        Args:
+            message: Main message text
+            incident_data: Optional dictionary containing incident details
+        Returns:
+            bool: True if notification was sent successfully
+        """
+        if not self.webhook_url:
+            print("⚠️ Slack webhook URL not configured")
+            return False
+
+        payload = self._build_payload(message, incident_data)
+
         try:
-            response = requests.post(self.webhook_url, json=payload)
-            if response.status_code == 200:
-                print("✅ Slack notification sent successfully")
-                return True
-            else:
-                print(f"❌ Failed to send Slack notification: {response.status_code}")
-                return False
+            session = await self._ensure_session()
+            for attempt in range(MAX_RETRIES + 1):
+                async with session.post(self.webhook_url, json=payload) as response:
+                    if response.status == 200:
+                        print("✅ Slack notification sent successfully")
+                        return True
+                    if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        print(f"❌ Failed to send Slack notification: {response.status}")
+                        return False
+                    retry_after = response.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else RETRY_BACKOFF_SEC * 2 ** attempt
+                await asyncio.sleep(delay)
         except Exception as e:
             print(f"❌ Error sending Slack notification: {str(e)}")
             return False
+
+    def enqueue(self, message: str, incident_data: Dict[str, Any] = None) -> None:
+        """
+        Queue a notification without waiting on Slack; a single consumer task
+        posts queued notifications in order. Must be called from a running event loop.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._consumer_task is None:
+            self._consumer_task = asyncio.create_task(self._consumer())
+        self._queue.put_nowait((message, incident_data))
+
+    async def _consumer(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            await self.send_notification(*item)
+
+    async def close(self):
+        """Post every queued notification, then close the shared HTTP session"""
+        if self._consumer_task is not None:
+            self._queue.put_nowait(None)  # sentinel: drain what is queued and stop
+            await self._consumer_task
+            self._consumer_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()